@@ -0,0 +1,55 @@
+"""
+Benchmark of browser startup and first page load for every browser profile from utils/browsers/browser_profiles.py.
+It uses the browser selected with BROWSER setting and the fixture page served from a local HTTP server.
+
+    python -m benchmarks.browser_startup_benchmark
+    python -m benchmarks.browser_startup_benchmark --launches 5 --profiles default headless
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.local_server import fixtures_server
+from utils.browsers.browser_profiles import PROFILES
+from utils.browsers.browser_selector import browser
+from utils.settings.settings import BROWSER
+
+
+def measure(profile, url, launches):
+    """
+    :return: dict with mean startup and first page load times in seconds
+    """
+    startups, loads = [], []
+    for _ in range(launches):
+        start = time.perf_counter()
+        started_browser = browser(profile)
+        startups.append(time.perf_counter() - start)
+        try:
+            start = time.perf_counter()
+            started_browser.driver.get(url)
+            loads.append(time.perf_counter() - start)
+        finally:
+            started_browser.driver.quit()
+    return {'startup': sum(startups) / launches, 'first_load': sum(loads) / launches}
+
+
+def run(profile_names, launches):
+    server = fixtures_server()
+    url = f"{server.url}/main_page.html"
+    try:
+        print(f"Browser: {BROWSER}, {launches} launches per profile")
+        for name in profile_names:
+            result = measure(PROFILES[name], url, launches)
+            print(f"  {name:20} startup {result['startup'] * 1000:9.1f}ms "
+                  f"first load {result['first_load'] * 1000:9.1f}ms")
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Startup time of browser profiles.')
+    parser.add_argument('--launches', type=int, default=3)
+    parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES))
+    arguments = parser.parse_args()
+    sys.exit(run(arguments.profiles, arguments.launches))
@@ -0,0 +1,66 @@
+"""
+Microbenchmark of ElementsList construction and reads.
+It doesn't need a browser - driver is replaced by an object that only counts WebDriver calls.
+
+    python -m benchmarks.elements_list_benchmark --elements 200
+"""
+import argparse
+import timeit
+
+from selenium.webdriver.remote.webelement import WebElement
+
+from utils.custom_element import CustomElement
+from utils.elements_list import ElementsList
+
+
+class CountingDriver(object):
+    """
+    Stand-in for WebDriver which answers every command immediately and counts round trips.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self, driver_command, params=None):
+        self.calls += 1
+        return {'value': ''}
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        return ['' for _ in args[0]]
+
+
+def measure(statement, number):
+    """
+    :return: average time of one statement run in microseconds
+    """
+    return timeit.timeit(statement, number=number) / number * 1000000
+
+
+def run(elements, number):
+    driver = CountingDriver()
+    raw_elements = [WebElement(driver, str(index)) for index in range(elements)]
+    wrapped_elements = [CustomElement(driver, element_id=str(index)) for index in range(elements)]
+    elements_list = ElementsList(driver, elements_list=raw_elements)
+
+    print(f"ElementsList of {elements} elements")
+    print(f"  wrap WebElements into CustomElements: "
+          f"{measure(lambda: ElementsList(driver, elements_list=raw_elements), number):.1f} us")
+    print(f"  pass already wrapped CustomElements:  "
+          f"{measure(lambda: ElementsList(driver, elements_list=wrapped_elements), number):.1f} us")
+    print(f"  single CustomElement wrap:            "
+          f"{measure(lambda: CustomElement(driver, element_id='0'), number * elements):.2f} us")
+
+    for name, read in (('get_texts_list', elements_list.get_texts_list),
+                       ('get_texts_list_bulk', elements_list.get_texts_list_bulk)):
+        driver.calls = 0
+        read()
+        print(f"  {name}: {driver.calls} WebDriver round trips")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Microbenchmark of ElementsList.')
+    parser.add_argument('--elements', type=int, default=200)
+    parser.add_argument('--number', type=int, default=1000)
+    arguments = parser.parse_args()
+    run(arguments.elements, arguments.number)
@@ -0,0 +1,66 @@
+"""
+Import time of environment.py measured with python -X importtime, which every behave run pays before the first scenario.
+behave.runner is imported first, behave has already loaded it when it imports environment.py.
+
+    python -m benchmarks.import_time_benchmark               # fails when median import time is above the budget
+    python -m benchmarks.import_time_benchmark --budget 100 --runs 10
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+from utils.settings.settings import PATH_TO_PROJECT
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure(module, preload):
+    """
+    :return: tuple of (cumulative import time of the module in ms, dict of top level imports and their times in ms)
+    """
+    code = f'import {preload}; import {module}' if preload else f'import {module}'
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=PATH_TO_PROJECT,
+                               capture_output=True, text=True)
+    if completed.returncode:
+        raise Exception(f"Importing {module} failed:\n{completed.stderr}")
+    # children are printed before their parent, one level deeper
+    total, imports, children = 0.0, {}, {}
+    for line in completed.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        if len(indent) == 3:
+            children[name] = int(cumulative) / 1000
+        elif len(indent) == 1:
+            if name == module:
+                total, imports = int(cumulative) / 1000, children
+            children = {}
+    return total, imports
+
+
+def run(module, preload, runs, budget, top):
+    results = [measure(module, preload) for _ in range(runs)]
+    median = statistics.median(total for total, _ in results)
+    print(f"import {module}: median {median:.1f}ms of {runs} runs, budget {budget:.1f}ms")
+    _, imports = results[-1]
+    for name, time_ms in sorted(imports.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {time_ms:8.1f}ms {name}")
+    if median > budget:
+        print(f"REGRESSION import time {median:.1f}ms is above the budget {budget:.1f}ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import time of environment.py.')
+    parser.add_argument('--module', default='environment')
+    parser.add_argument('--preload', default='behave.runner', help='modules imported before, not measured')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=150.0, help='allowed median import time in ms')
+    parser.add_argument('--top', type=int, default=10, help='how many slowest direct imports are listed')
+    arguments = parser.parse_args()
+    sys.exit(run(arguments.module, arguments.preload, arguments.runs, arguments.budget, arguments.top))
@@ -0,0 +1,44 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer(object):
+
+    def __init__(self, handler_class, port=0):
+        """
+        HTTP server running in a background thread on 127.0.0.1.
+        :param handler_class: request handler class
+        :param port: port to listen on, 0 picks a free one
+        """
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), handler_class)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def fixtures_server(directory=FIXTURES_DIR, port=0):
+    """
+    :return: started LocalServer serving fixture html files
+    """
+    return LocalServer(functools.partial(QuietHandler, directory=directory), port).start()
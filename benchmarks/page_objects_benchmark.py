@@ -0,0 +1,164 @@
+"""
+Benchmark of the page-object layer: BasePage, CustomElement, ElementsList and MainHeader operations.
+It runs against fixture html served from a local HTTP server in headless Chrome when chromedriver is on PATH,
+otherwise against a local W3C WebDriver stub.
+
+    python -m benchmarks.page_objects_benchmark                  # run and compare with stored baselines
+    python -m benchmarks.page_objects_benchmark --save-baseline  # run and store results as new baselines
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+from benchmarks.local_server import fixtures_server
+from benchmarks.webdriver_stub import webdriver_stub
+from pages.main_header import MainHeader
+from utils.command_tracer import CommandTracer
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+PRODUCTS = "//div[@class='product-container']"
+PRODUCT_NAME = "a.product-name"
+PRODUCT_NAMES = "//a[@class='product-name']"
+
+
+def start_driver():
+    """
+    :return: tuple of (backend name, driver, url of fixture page, list of servers to stop)
+    """
+    chromedriver = shutil.which('chromedriver')
+    if chromedriver:
+        server = fixtures_server()
+        options = webdriver.ChromeOptions()
+        options.add_argument('--headless')
+        options.add_argument('--no-sandbox')
+        driver = webdriver.Chrome(options=options, executable_path=chromedriver)
+        return 'chrome', driver, f"{server.url}/main_page.html", [server]
+    stub = webdriver_stub()
+    driver = webdriver.Remote(command_executor=stub.url, desired_capabilities={'browserName': 'chrome'})
+    return 'stub', driver, 'http://stub.local/main_page.html', [stub]
+
+
+def operations(page):
+    """
+    :return: list of (operation name, function) pairs
+    """
+    def products():
+        return page.get_elements_list(PRODUCTS, By.XPATH)
+
+    return [
+        ('BasePage.get_element', lambda: page.get_element(page.main_logo, By.XPATH)),
+        ('BasePage.is_element_present (absent)', lambda: page.is_element_present(page.account_button, By.XPATH)),
+        ('MainHeader.get_main_banner', lambda: page.get_main_banner()),
+        ('ElementsList.__init__', products),
+        ('ElementsList.get_texts_list', lambda: products().get_texts_list()),
+        ('ElementsList.get_texts_list_bulk', lambda: products().get_texts_list_bulk()),
+        ('ElementsList.get_element_by_text',
+         lambda: page.get_elements_list(PRODUCT_NAMES, By.XPATH).get_element_by_text('Product 150')),
+        ('ElementsList.get_elements_by_attribute',
+         lambda: products().get_elements_by_attribute('class', 'product', partial_value=True)),
+        ('ElementsList.get_element_by_inner_text',
+         lambda: products().get_element_by_inner_text('Product 150', PRODUCT_NAME)),
+        ('ElementsList.get_inner_elements_list', lambda: products().get_inner_elements_list(PRODUCT_NAME)),
+    ]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def measure(operation, tracer, iterations):
+    """
+    :return: dict with ops_per_sec, round_trips, p50 and p99 in milliseconds
+    """
+    operation()
+    tracer.records = []
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    round_trips = len(tracer.records) / iterations
+    tracer.records = []
+    timings.sort()
+    return {'ops_per_sec': iterations / sum(timings), 'round_trips': round_trips,
+            'p50': percentile(timings, 0.5) * 1000, 'p99': percentile(timings, 0.99) * 1000}
+
+
+def compare(backend, results, tolerance=None):
+    """
+    Round trips are deterministic and always compared, latency depends on the machine
+    and is compared only when tolerance is given.
+    :param tolerance: allowed p50 slowdown, None to report latency for information only
+    :return: list of regressions against stored baselines, an operation without a baseline is a regression too,
+             so a check can't pass because baselines were never stored
+    """
+    baselines = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH) as baselines_file:
+            baselines = json.load(baselines_file).get(backend, {})
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if not baseline:
+            regressions.append(f"{name}: no baseline for {backend} backend, run with --save-baseline")
+            continue
+        if result['round_trips'] > baseline['round_trips']:
+            regressions.append(f"{name}: {result['round_trips']:.1f} round trips, "
+                               f"baseline {baseline['round_trips']:.1f}")
+        if tolerance is not None and result['p50'] > baseline['p50'] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {result['p50']:.2f}ms, baseline {baseline['p50']:.2f}ms")
+    return regressions
+
+
+def save_baseline(backend, results):
+    baselines = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH) as baselines_file:
+            baselines = json.load(baselines_file)
+    baselines[backend] = results
+    with open(BASELINES_PATH, 'w') as baselines_file:
+        json.dump(baselines, baselines_file, indent=2, sort_keys=True)
+
+
+def run(iterations, tolerance, store_baseline):
+    backend, driver, url, servers = start_driver()
+    tracer = CommandTracer(output_dir='')
+    tracer.install(driver)
+    page = MainHeader(driver)
+    results = {}
+    try:
+        page.get_page(url)
+        print(f"Backend: {backend}, {iterations} iterations")
+        for name, operation in operations(page):
+            results[name] = measure(operation, tracer, iterations)
+            result = results[name]
+            print(f"  {name:45} {result['ops_per_sec']:9.1f} ops/s {result['round_trips']:7.1f} round trips "
+                  f"p50 {result['p50']:8.2f}ms p99 {result['p99']:8.2f}ms")
+    finally:
+        driver.quit()
+        for server in servers:
+            server.stop()
+    if store_baseline:
+        save_baseline(backend, results)
+        return 0
+    regressions = compare(backend, results, tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark of the page-object layer.')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help='fail when p50 is slower than the baseline by more than this, 0.25 means 25%%; '
+                             'latency is not checked by default, it depends on the machine')
+    parser.add_argument('--save-baseline', action='store_true')
+    arguments = parser.parse_args()
+    sys.exit(run(arguments.iterations, arguments.tolerance, arguments.save_baseline))
@@ -0,0 +1,143 @@
+"""
+Minimal W3C WebDriver endpoint used by benchmarks when there is no browser installed.
+Every locator finds the same list of elements, so benchmarks measure overhead of the framework,
+the HTTP layer and number of round trips, not the browser.
+"""
+import json
+import re
+import uuid
+from http.server import BaseHTTPRequestHandler
+
+from benchmarks.local_server import LocalServer
+from utils import js_scripts
+
+W3C_ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+LIST_SIZE = 200
+
+
+class StubDom(object):
+
+    def __init__(self, list_size=LIST_SIZE):
+        self.element_ids = [f"stub-{number}" for number in range(1, list_size + 1)]
+
+    @staticmethod
+    def text(element_id):
+        return f"Product {element_id.split('-')[1]}"
+
+    @staticmethod
+    def attribute(element_id, name):
+        number = element_id.split('-')[1]
+        return {'class': f"product-name item-{number}", 'href': f"product_{number}.html"}.get(name)
+
+    @staticmethod
+    def inner(element_id):
+        return f"{element_id}-inner"
+
+    def execute_script(self, script, args):
+        elements = [self._id_of(element) for element in args[0]] if args and isinstance(args[0], list) else []
+        if script == js_scripts.BULK_TEXTS:
+            return [self.text(element_id) for element_id in elements]
+        if script in (js_scripts.BULK_ATTRIBUTES, js_scripts.BULK_PROPERTIES):
+            return [self.attribute(element_id, args[1]) for element_id in elements]
+        if script == js_scripts.BULK_VISIBILITY:
+            return [True for _ in elements]
+        if script == js_scripts.BULK_RECORDS:
+            return [{'text': self.text(element_id), 'visible': True,
+                     'attributes': {name: self.attribute(element_id, name) for name in args[1]},
+                     'properties': {name: self.attribute(element_id, name) for name in args[2]}}
+                    for element_id in elements]
+        if script == js_scripts.FILTER_ELEMENTS:
+            return self._filter(elements, elements, args[1], args[2], args[3], args[4])
+        if script == js_scripts.FILTER_BY_INNER_ELEMENTS:
+            if args[4] is None:
+                return {'matches': [self._reference(self.inner(e)) for e in elements], 'values': [], 'missing': -1}
+            targets = [self.inner(element_id) for element_id in elements] if args[7] else elements
+            return dict(self._filter(elements, targets, args[3], args[4], args[5], args[6]), missing=-1)
+        if script == js_scripts.ELEMENT_PRESENCE:
+            return {'present': False, 'visible': False}
+        if len(args) == 2 and isinstance(args[1], str):
+            return self.attribute(self._id_of(args[0]), args[1])
+        return True
+
+    def _filter(self, elements, targets, attribute, expected, partial, first_only):
+        matches, values = [], []
+        for element_id, target in zip(elements, targets):
+            value = self.text(element_id) if attribute is None else self.attribute(element_id, attribute)
+            values.append(value)
+            if value is not None and (expected in value if partial else expected == value):
+                matches.append(self._reference(target))
+                if first_only:
+                    break
+        return {'matches': matches, 'values': values}
+
+    @staticmethod
+    def _reference(element_id):
+        return {W3C_ELEMENT_KEY: element_id}
+
+    @staticmethod
+    def _id_of(element):
+        return element.get(W3C_ELEMENT_KEY) or element.get('ELEMENT')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    dom = StubDom()
+    requests = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._respond(self._route('GET', {}))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        self._respond(self._route('POST', body))
+
+    def do_DELETE(self):
+        self._respond(None)
+
+    def _route(self, method, body):
+        type(self).requests += 1
+        path = self.path.rstrip('/')
+        if path == '/session' and method == 'POST':
+            return {'sessionId': uuid.uuid4().hex, 'capabilities': {'browserName': 'stub', 'platformName': 'any'}}
+        command = re.sub(r'^/session/[^/]+', '', path)
+        if command in ('/element', '/element/active'):
+            return {W3C_ELEMENT_KEY: self.dom.element_ids[0]}
+        if command == '/elements':
+            return [{W3C_ELEMENT_KEY: element_id} for element_id in self.dom.element_ids]
+        element = re.match(r'^/element/([^/]+)/(.+)$', command)
+        if element:
+            element_id, element_command = element.groups()
+            if element_command == 'element':
+                return {W3C_ELEMENT_KEY: self.dom.inner(element_id)}
+            if element_command == 'elements':
+                return [{W3C_ELEMENT_KEY: self.dom.inner(element_id)}]
+            if element_command == 'text':
+                return self.dom.text(element_id.replace('-inner', ''))
+            if element_command in ('displayed', 'enabled'):
+                return True
+            return None
+        if command in ('/execute/sync', '/execute/async'):
+            return self.dom.execute_script(body.get('script'), body.get('args', []))
+        if command == '/url' and method == 'GET':
+            return 'http://stub.local/main_page.html'
+        if command == '/window/handles':
+            return ['stub-window']
+        return None
+
+    def _respond(self, value):
+        payload = json.dumps({'value': value}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def webdriver_stub(port=0):
+    """
+    :return: started LocalServer answering W3C WebDriver commands
+    """
+    return LocalServer(StubHandler, port).start()
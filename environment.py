@@ -1,48 +1,128 @@
+import os
+import warnings
+
 from behave.runner import Context
 
-from pages.main_header import MainHeader
-from utils.base_page import BasePage
+from utils.artifact_writer import ArtifactWriter
 from utils.browsers.browser_selector import browser
+from utils.browsers.resource_blocking import BlockingRules
+from utils.browsers.session_pool import SessionPool
+from utils.command_tracer import CommandTracer
+from utils.fake_persons.base_fake_person import FakePerson
 from utils.fake_persons.fake_client import FakeClient
-
-
-def start_driver():
-    driver = browser().driver
+from utils.locator_profiler import LocatorProfiler
+from utils.page_registry import page_registry
+from utils.settings.settings import USE_SESSION_POOL, ARTIFACTS_DIR, PRINT_WAIT_STATISTICS, TRACE_WEBDRIVER_COMMANDS, \
+    USE_CACHING_PROXY, SCREENSHOT_FORMAT, SCREENSHOT_QUALITY, PERSONS_SEED, PROFILE_LOCATORS
+from utils.state_snapshots import login_flows, roles_of
+from utils.wait_engine import wait_engine
+
+
+def start_driver(session_pool=None, tracer=None):
+    if session_pool:
+        driver = session_pool.acquire()
+    else:
+        driver = browser().driver
+    if tracer:
+        tracer.install(driver)
     return driver
 
 
 def before_all(context):
+    context.caching_proxy = None
+    if USE_CACHING_PROXY:
+        # http server modules are imported only when the proxy is used
+        from utils.caching_proxy import CachingProxy
+        context.caching_proxy = CachingProxy.start_if_not_running()
     context.stuff = Stuff(context)
     context.client = context.stuff.client()
+    context.session_pool = SessionPool() if USE_SESSION_POOL else None
+    context.blocking_rules = BlockingRules.from_setting()
+    context.artifact_writer = ArtifactWriter(os.path.join(ARTIFACTS_DIR, 'failures'), SCREENSHOT_FORMAT,
+                                             SCREENSHOT_QUALITY)
+    context.tracer = CommandTracer(os.path.join(ARTIFACTS_DIR, 'traces')) if TRACE_WEBDRIVER_COMMANDS else None
+    context.locator_profiler = LocatorProfiler().install() if PROFILE_LOCATORS else None
 
 
 def before_scenario(context, scenario):
-    context.driver = start_driver()
-    context.environment = Environment(context, context.driver)
-    pages = context.environment._origin
-    behave = ("feature", "text", "table", "stdout_capture", "stderr_capture", "log_capture", "fail_on_cleanup_errors")
-    for behave_item in behave:
-        pages.pop(behave_item, None)
-    for page in pages:
-        setattr(context, page, getattr(context.environment, page))
+    if PERSONS_SEED:
+        FakePerson.seed(f"{PERSONS_SEED}:{scenario.feature.name}:{scenario.name}")
+    if context.tracer:
+        context.tracer.start_scenario(scenario.feature.name, scenario.name)
+    context.driver = start_driver(context.session_pool, context.tracer)
+    # the only place where rules are applied, Chrome gets rules of the scenario tags or of BLOCKED_RESOURCES
+    blocking_rules = BlockingRules.from_tags(scenario.effective_tags, context.blocking_rules)
+    if not blocking_rules.apply(context.driver) and blocking_rules is not context.blocking_rules:
+        warnings.warn(f"{scenario.name}: blocking tags are ignored, {type(context.driver).__name__} "
+                      f"can't block requests at runtime")
+    # page objects (context.pages.base, context.pages.main_header, ...) are created on first use in the scenario
+    context.pages = page_registry.bind(context.driver)
+    for role in roles_of(scenario.effective_tags):
+        start_as_role(context, role)
+
+
+def start_as_role(context, role):
+    """
+    Restores snapshot of signed in state of the role, scenario starts already signed in.
+    Without a valid snapshot the login flow registered for the role is run and its state is captured.
+    """
+    snapshot = context.pages.base.restore_state(role)
+    if snapshot is None:
+        if role not in login_flows:
+            raise Exception(f"No valid state snapshot of role {role} and no login flow registered for it")
+        account = login_flows[role](context)
+        snapshot = context.pages.base.capture_state(role, account)
+    context.role_account = snapshot['account']
 
 
 def after_scenario(context, scenario):
-    context.driver.close()
+    if context.session_pool:
+        context.session_pool.release(context.driver, failed=scenario.status == 'failed')
+    else:
+        context.driver.close()
+    if context.tracer:
+        context.tracer.finish_scenario()
+
+
+def before_step(context, step):
+    if context.tracer:
+        context.tracer.start_step(step.name)
 
 
 def after_step(context, step):
     if step.status == 'failed':
-        step_str = step.name
-        context.driver.save_screenshot(f"{step_str}.png")
+        context.artifact_writer.capture(context.driver, context.feature.name, context.scenario.name, step.name)
+    if context.tracer:
+        context.tracer.finish_step()
+
+
+def after_all(context):
+    context.artifact_writer.close()
+    if context.artifact_writer.captures:
+        print(context.artifact_writer.report())
+    if context.session_pool:
+        context.session_pool.close_all()
+        print(context.session_pool.report())
+    if PRINT_WAIT_STATISTICS:
+        print(wait_engine.report())
+    if context.tracer:
+        print(context.tracer.summary())
+    if context.locator_profiler:
+        context.locator_profiler.save(os.path.join(ARTIFACTS_DIR, 'locator_profile.json'))
+        print(context.locator_profiler.report())
+    if context.caching_proxy:
+        context.caching_proxy.stop()
+        print(context.caching_proxy.report())
 
 
 class Environment(Context):
 
     def __init__(self, runner, driver):
+        """
+        Context with page objects of the driver from the page registry, each created on first access.
+        """
         super().__init__(runner)
-        self.base = BasePage(driver)
-        self.main_header = MainHeader(driver)
+        self.pages = page_registry.bind(driver)
 
 
 class Stuff(Context):
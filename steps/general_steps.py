@@ -8,9 +8,9 @@ class GeneralSteps(Environment):
 
     @when(u'The user opens up main page')
     def step_impl(context):
-        context.base.get_page(USER_PRODUCTION_URL)
+        context.pages.base.get_page(USER_PRODUCTION_URL)
 
     @then(u'The user sees main logo')
     def step_impl(context):
-        main_banner = context.main_header.get_main_banner()
+        main_banner = context.pages.main_header.get_main_banner()
         assert main_banner.is_displayed()
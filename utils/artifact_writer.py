@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+import importlib.util
+import io
+import itertools
+import json
+import os
+import queue
+import re
+import threading
+import time
+
+# optional, without Pillow screenshots are stored as png, it is imported in the writer thread
+PILLOW_INSTALLED = importlib.util.find_spec('PIL') is not None
+IMAGE_FORMATS = ('png', 'jpeg', 'webp')
+
+
+class FailureCapture(object):
+
+    def __init__(self, sequence, feature, scenario, step, screenshot, page_source, url):
+        """
+        :param sequence: number of the capture in the run, keeps captures of scenarios and steps with the same names
+                        (scenario outlines, repeated steps) apart
+        """
+        self.sequence = sequence
+        self.feature = feature
+        self.scenario = scenario
+        self.step = step
+        self.screenshot = screenshot
+        self.page_source = page_source
+        self.url = url
+        self.captured_at = time.time()
+
+
+class ArtifactWriter(object):
+
+    def __init__(self, output_dir, image_format='webp', quality=80):
+        """
+        Writes failure artifacts (screenshot, page source, url) in a background thread,
+        so compression and disk I/O don't add to scenario time.
+        Artifacts are laid out as <output_dir>/<feature>/<scenario>/<number of the capture>_<step>/,
+        identical screenshots and page sources are stored once and referenced from meta.json.
+        :param output_dir: root directory of artifacts
+        :param image_format: "webp", "jpeg" or "png", webp and jpeg need Pillow
+        :param quality: quality of webp and jpeg compression
+        """
+        if image_format not in IMAGE_FORMATS:
+            raise Exception(f"Unsupported screenshot format {image_format!r}, use one of: {', '.join(IMAGE_FORMATS)}")
+        self.output_dir = output_dir
+        self.image_format = image_format if PILLOW_INSTALLED else 'png'
+        self.quality = quality
+        self.queue = queue.Queue()
+        self.written = {}
+        self.errors = []
+        self.captures = 0
+        self.duplicates = 0
+        self.sequence = itertools.count(1)
+        self.thread = threading.Thread(target=self._work, daemon=True)
+        self.thread.start()
+
+    def capture(self, driver, feature, scenario, step):
+        """
+        Grabs screenshot bytes, page source and url of the driver and queues them for writing.
+        Only WebDriver calls are made here, everything else happens in the writer thread.
+        """
+        self.queue.put(FailureCapture(next(self.sequence), feature, scenario, step,
+                                      self._safe(driver.get_screenshot_as_png),
+                                      self._safe(lambda: driver.page_source), self._safe(lambda: driver.current_url)))
+
+    def close(self):
+        """
+        Waits until every queued capture is written and stops the writer thread.
+        """
+        self.queue.put(None)
+        self.thread.join()
+
+    def report(self):
+        lines = [f"Failure artifacts: {self.captures} captures, {self.duplicates} duplicated files not written, "
+                 f"saved in {self.output_dir}"]
+        lines.extend(f"  failed to write: {error}" for error in self.errors)
+        return "\n".join(lines)
+
+    # -------------------------------------------------------------------------------------------------------
+    # writer thread
+    def _work(self):
+        while True:
+            capture = self.queue.get()
+            if capture is None:
+                return
+            try:
+                self._write(capture)
+            except Exception as error:
+                self.errors.append(f"{capture.scenario} / {capture.step}: {error}")
+
+    def _write(self, capture):
+        directory = os.path.join(self.output_dir, self._file_name(capture.feature), self._file_name(capture.scenario),
+                                 f"{capture.sequence:04d}_{self._file_name(capture.step)}")
+        os.makedirs(directory, exist_ok=True)
+        meta = {'url': capture.url, 'captured_at': capture.captured_at}
+        if capture.screenshot:
+            meta['screenshot'] = self._store(directory, f"screenshot.{self.image_format}", capture.screenshot,
+                                             self._compress_image)
+        if capture.page_source:
+            meta['page_source'] = self._store(directory, 'page_source.html.gz', capture.page_source.encode(),
+                                              lambda content: gzip.compress(content, compresslevel=6))
+        with open(os.path.join(directory, 'meta.json'), 'w') as meta_file:
+            json.dump(meta, meta_file, indent=2)
+        self.captures += 1
+
+    def _store(self, directory, file_name, content, compress):
+        """
+        :param content: raw bytes, identical captures are recognized by their hash before compression
+        :param compress: function compressing the content
+        :return: path of the file relative to output_dir, the first copy when the same content was already written
+        """
+        digest = hashlib.sha1(content).hexdigest()
+        if digest in self.written:
+            self.duplicates += 1
+            return self.written[digest]
+        with open(os.path.join(directory, file_name), 'wb') as artifact_file:
+            artifact_file.write(compress(content))
+        self.written[digest] = os.path.relpath(os.path.join(directory, file_name), self.output_dir)
+        return self.written[digest]
+
+    def _compress_image(self, png):
+        if self.image_format == 'png':
+            return png
+        from PIL import Image
+        image = Image.open(io.BytesIO(png))
+        if self.image_format == 'jpeg':
+            image = image.convert('RGB')
+        output = io.BytesIO()
+        image.save(output, format=self.image_format.upper(), quality=self.quality)
+        return output.getvalue()
+
+    @staticmethod
+    def _file_name(name):
+        return re.sub(r'\W+', '_', name or 'unknown').strip('_')[:100]
+
+    @staticmethod
+    def _safe(get):
+        try:
+            return get()
+        except Exception:
+            return None
@@ -1,20 +1,95 @@
+import io
 import os
+import threading
 
-FEMALE_AVATARS = {'avatar_1': os.path.abspath('utils/avatars/female_avatars/female_avatar_1.jfif'),
-                  'avatar_2': os.path.abspath('utils/avatars/female_avatars/female_avatar_2.jfif'),
-                  'avatar_3': os.path.abspath('utils/avatars/female_avatars/female_avatar_3.jfif'),
-                  'avatar_4': os.path.abspath('utils/avatars/female_avatars/female_avatar_4.jfif'),
-                  'avatar_5': os.path.abspath('utils/avatars/female_avatars/female_avatar_5.jfif'),
-                  'avatar_6': os.path.abspath('utils/avatars/female_avatars/female_avatar_6.jfif'),
-                  'avatar_7': os.path.abspath('utils/avatars/female_avatars/female_avatar_7.jfif'),
-                  'avatar_8': os.path.abspath('utils/avatars/female_avatars/female_avatar_8.jfif')}
-
-MALE_AVATARS = {'avatar_1': os.path.abspath('utils/avatars/male_avatars/male_avatar_1.jfif'),
-                'avatar_2': os.path.abspath('utils/avatars/male_avatars/male_avatar_2.jfif'),
-                'avatar_3': os.path.abspath('utils/avatars/male_avatars/male_avatar_3.jfif'),
-                'avatar_4': os.path.abspath('utils/avatars/male_avatars/male_avatar_4.jfif'),
-                'avatar_5': os.path.abspath('utils/avatars/male_avatars/male_avatar_5.jfif'),
-                'avatar_6': os.path.abspath('utils/avatars/male_avatars/male_avatar_6.jfif'),
-                'avatar_7': os.path.abspath('utils/avatars/male_avatars/male_avatar_7.jfif'),
-                'avatar_8': os.path.abspath('utils/avatars/male_avatars/male_avatar_8.jfif')}
+try:
+    # optional, without Pillow original files are uploaded
+    from PIL import Image
+except ImportError:
+    Image = None
 
+from utils.settings.settings import AVATAR_UPLOAD_SIZE, PATH_TO_PROJECT
+
+AVATARS_DIR = os.path.dirname(os.path.abspath(__file__))
+VARIANTS_DIR = os.path.join(PATH_TO_PROJECT, '.avatar_variants')
+
+FEMALE_AVATARS = {f'avatar_{number}': os.path.join(AVATARS_DIR, 'female_avatars', f'female_avatar_{number}.jfif')
+                  for number in range(1, 9)}
+
+MALE_AVATARS = {f'avatar_{number}': os.path.join(AVATARS_DIR, 'male_avatars', f'male_avatar_{number}.jfif')
+                for number in range(1, 9)}
+
+
+class AvatarRegistry(object):
+
+    def __init__(self, variants_dir=VARIANTS_DIR):
+        """
+        Avatars by sex with lazily loaded and cached bytes and downscaled variants for uploads.
+        :param variants_dir: directory where downscaled variants are kept between runs
+        """
+        self.avatars = {'female': FEMALE_AVATARS, 'male': MALE_AVATARS}
+        self.variants_dir = variants_dir
+        self._bytes = {}
+        self._variants = {}
+        self._lock = threading.Lock()
+
+    def path(self, sex, name='avatar_1'):
+        if sex not in self.avatars:
+            raise Exception(f"Wrong sex of avatar: {sex}. Available: {list(self.avatars)}")
+        return self.avatars[sex][name]
+
+    def get_bytes(self, sex, name='avatar_1'):
+        """
+        :return: content of the avatar file, read from disk only once
+        """
+        with self._lock:
+            return self._read(self.path(sex, name))
+
+    def upload_path(self, sex, name='avatar_1', max_size=AVATAR_UPLOAD_SIZE):
+        """
+        :param max_size: longest side in pixels, 0 uploads the original file
+        :return: path to the smallest file to upload, a downscaled jpeg variant when Pillow is installed
+        """
+        path = self.path(sex, name)
+        if not max_size or Image is None:
+            return path
+        key = (path, max_size)
+        with self._lock:
+            if key not in self._variants:
+                self._variants[key] = self._make_variant(path, max_size)
+            return self._variants[key]
+
+    def for_person(self, person, name=None, max_size=AVATAR_UPLOAD_SIZE):
+        """
+        :param person: FakePerson object, its sex selects female or male avatars
+        :param name: i.e. "avatar_3", picked by the person's generator when not given
+        :return: path to upload
+        """
+        name = name or person.get_random().choice(sorted(self.avatars[person.sex]))
+        return self.upload_path(person.sex, name, max_size)
+
+    # -------------------------------------------------------------------------------------------------------
+    # others
+    def _make_variant(self, path, max_size):
+        file_name = os.path.splitext(os.path.basename(path))[0]
+        variant_path = os.path.join(self.variants_dir, f"{file_name}_{max_size}.jpg")
+        if os.path.exists(variant_path) and os.path.getmtime(variant_path) >= os.path.getmtime(path):
+            return variant_path if os.path.getsize(variant_path) < os.path.getsize(path) else path
+        image = Image.open(io.BytesIO(self._read(path)))
+        if max(image.size) <= max_size:
+            return path
+        image.thumbnail((max_size, max_size))
+        os.makedirs(self.variants_dir, exist_ok=True)
+        temporary_path = f"{variant_path}.{os.getpid()}.tmp"
+        image.convert('RGB').save(temporary_path, format='JPEG', quality=85, optimize=True)
+        os.replace(temporary_path, variant_path)
+        return variant_path if os.path.getsize(variant_path) < os.path.getsize(path) else path
+
+    def _read(self, path):
+        if path not in self._bytes:
+            with open(path, 'rb') as avatar_file:
+                self._bytes[path] = avatar_file.read()
+        return self._bytes[path]
+
+
+avatars = AvatarRegistry()
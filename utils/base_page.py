@@ -1,22 +1,29 @@
-import time
 from urllib.parse import urlparse
 
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
+from utils import dom_waits, js_scripts
 from utils.custom_element import CustomElement
+from utils.element_cache import ElementCache
 from utils.elements_list import ElementsList
+from utils.locator_compiler import compile_locator
 from utils.settings.local_settings import EXPLICITLY_WAIT
-from utils.settings.settings import LOCATOR_SEARCHING_METHOD
+from utils.settings.settings import LOCATOR_SEARCHING_METHOD, USE_ELEMENT_CACHE, DOM_SETTLED_QUIET_PERIOD, \
+    COMPILE_LOCATORS
+from utils.state_snapshots import snapshot_store, COOKIE_KEYS
+from utils.wait_engine import wait_engine
 
 
 class BasePage(object):
+    # attribute of context.pages the page object is available under, snake case of the class name when not set
+    context_name = 'base'
 
     def __init__(self, driver: WebDriver):
         self.driver = driver
+        self.element_cache = ElementCache.for_driver(driver)
 
     # -------------------------------------------------------------------------------------------------------
     # elements
@@ -35,9 +42,34 @@ class BasePage(object):
                           with false WebdriverWait will be looking for element located in DOM
         :return: CustomElement object
         """
+        locator_type, locator = self._compiled(locator, locator_type)
+        if USE_ELEMENT_CACHE and locator and not element_id:
+            return self.element_cache.get((locator_type, locator, is_visible), lambda: CustomElement(
+                self.driver, locator=locator, locator_type=locator_type, w3c=w3c, is_visible=is_visible))
         return CustomElement(self.driver, locator=locator, locator_type=locator_type,
                              element_id=element_id, w3c=w3c, is_visible=is_visible)
 
+    def get_lazy_element(self, locator, locator_type=LOCATOR_SEARCHING_METHOD, is_visible=True):
+        """
+        Element is not searched for until first command is sent to it,
+        so it can be created and passed along without waiting.
+        :param locator: "div[class*='something']"
+        :param locator_type: By.XPATH (By can be imported from selenium.webdriver.common.by)
+        :param is_visible: true will cause that WebDriverWait will be looking for visible element on first use,
+                          with false WebdriverWait will be looking for element located in DOM
+        :return: CustomElement object
+        """
+        locator_type, locator = self._compiled(locator, locator_type)
+        return CustomElement(self.driver, locator=locator, locator_type=locator_type, is_visible=is_visible, lazy=True)
+
+    def is_element_present(self, locator, locator_type=LOCATOR_SEARCHING_METHOD, is_visible=True, wait=0):
+        """
+        Quick check for negative assertions like "cart is empty", which doesn't wait out the explicit wait.
+        :param wait: how many seconds at most to wait for the element, 0 means checking only once
+        :return: True if element is present (and visible when is_visible is True)
+        """
+        return self.get_lazy_element(locator, locator_type, is_visible).exists(wait)
+
     def get_elements_list(self,
                           locator=None,
                           locator_type=LOCATOR_SEARCHING_METHOD,
@@ -52,6 +84,7 @@ class BasePage(object):
                           with false WebdriverWait will be looking for elements located in DOM
         :return: ElementsList object
         """
+        locator_type, locator = self._compiled(locator, locator_type)
         return ElementsList(self.driver, locator=locator, locator_type=locator_type,
                             elements_list=elements_list, is_visible=is_visible)
 
@@ -69,12 +102,28 @@ class BasePage(object):
         locator = f'{partial_xpath_locator}[contains(text(), "{text}")]'
         return CustomElement(self.driver, locator=locator, locator_type=By.XPATH, is_visible=is_visible)
 
+    @staticmethod
+    def _compiled(locator, locator_type):
+        """
+        With COMPILE_LOCATORS xpath locators are replaced with equivalent css selectors, see utils.locator_compiler
+        """
+        if COMPILE_LOCATORS:
+            return compile_locator(locator, locator_type)
+        return locator_type, locator
+
+    def get_element_cache_statistics(self):
+        """
+        :return: dict with number of element cache hits, misses, invalidations and currently cached elements
+        """
+        return self.element_cache.statistics()
+
     # -------------------------------------------------------------------------------------------------------
     # page
     def get_page(self, url):
         """
         Opens desired url
         """
+        self.element_cache.invalidate()
         self.driver.get(url)
         return url
 
@@ -82,12 +131,14 @@ class BasePage(object):
         """
         Refreshes the page
         """
+        self.element_cache.invalidate()
         self.driver.refresh()
 
     def back_page(self):
         """
         Simulates clicking on a browser back button.
         """
+        self.element_cache.invalidate()
         self.driver.back()
 
     # -------------------------------------------------------------------------------------------------------
@@ -138,6 +189,48 @@ class BasePage(object):
         """
         return self.read_page_url()[-nth:]
 
+    # -------------------------------------------------------------------------------------------------------
+    # state snapshots
+    def capture_state(self, role, account=None, store=snapshot_store):
+        """
+        Saves cookies, local and session storage of the current page for the role,
+        so next scenarios can start signed in with restore_state instead of going through the sign in form.
+        :param role: name of the role, i.e. "client"
+        :param account: dict with data of the signed in account, i.e. {"email": client.email}
+        :return: snapshot dict
+        """
+        parsed_url = self.parse_current_url()
+        storage = self.driver.execute_script(js_scripts.READ_STORAGE)
+        snapshot = {
+            'origin': f"{parsed_url.scheme}://{parsed_url.netloc}/",
+            'url': self.read_page_url(),
+            'cookies': [{key: cookie[key] for key in COOKIE_KEYS if key in cookie}
+                        for cookie in self.driver.get_cookies()],
+            'local_storage': storage['local'],
+            'session_storage': storage['session'],
+            'account': account,
+        }
+        store.save(role, snapshot)
+        return snapshot
+
+    def restore_state(self, role, store=snapshot_store):
+        """
+        Opens origin of the snapshot and puts cookies, local and session storage of the role into the browser.
+        :return: snapshot dict or None when there is no valid snapshot of the role
+        """
+        snapshot = store.load(role)
+        if not snapshot:
+            return None
+        self.get_page(snapshot['origin'])
+        self.driver.delete_all_cookies()
+        for cookie in snapshot['cookies']:
+            if 'expiry' in cookie:
+                cookie['expiry'] = int(cookie['expiry'])
+            self.driver.add_cookie(cookie)
+        self.driver.execute_script(js_scripts.WRITE_STORAGE, snapshot['local_storage'], snapshot['session_storage'])
+        self.element_cache.invalidate()
+        return snapshot
+
     # -------------------------------------------------------------------------------------------------------
     # windows and tabs
     def set_tab(self, window_index):
@@ -152,6 +245,7 @@ class BasePage(object):
         """
         :param which_tab: window object that we want to switch to
         """
+        self.element_cache.invalidate()
         return self.driver.switch_to_window(which_tab)
 
     def open_new_tab(self):
@@ -164,6 +258,7 @@ class BasePage(object):
         """
         Closes currently open and focused tab
         """
+        self.element_cache.invalidate()
         return self.driver.close()
 
     def open_new_tab_and_close_previous(self):
@@ -187,30 +282,53 @@ class BasePage(object):
     # waits
 
     # wait below should be remove from properly built test
-    @staticmethod
-    def waits(seconds):
+    def waits(self, seconds):
         """
-        Using this there is no need to import time library each time.
-        :param seconds: how many seconds should wait
+        Former fixed sleep, now waits at most given seconds for the page to stop changing
+        and returns as soon as there were no DOM changes for DOM_SETTLED_QUIET_PERIOD (or seconds when it is shorter).
+        It is an instance method now, call it on a page object.
+        :param seconds: how many seconds at most should wait
+        :return: True if DOM settled before the wait ended
         """
-        return time.sleep(seconds)
+        return dom_waits.wait_for_dom_settled(self.driver, quiet_period=min(DOM_SETTLED_QUIET_PERIOD, seconds),
+                                              wait=seconds)
 
     def wait_for_number_of_tabs(self, number_of_tabs, wait=EXPLICITLY_WAIT):
         """
         Waits for certain number of tabs in the browser
         :param number_of_tabs: on how many tabs have to wait
         """
-        return WebDriverWait(self.driver, wait).until(EC.number_of_windows_to_be(number_of_tabs))
+        return wait_engine.until(self.driver, EC.number_of_windows_to_be(number_of_tabs), wait)
 
-    def wait_for_url_to_appear(self):
+    def wait_for_url_to_appear(self, wait=EXPLICITLY_WAIT):
         """
         Sometimes page opens, but if we read url it will be empty string.
         This method waits until the url will be present.
+        Unlike the former loop, which never ended when no url appeared, it gives up after wait seconds.
+        :raises TimeoutException: when there is still no url after wait seconds
+        :return: current url
+        """
+        return dom_waits.wait_for_netloc(self.driver, wait)
+
+    def wait_for_url_change(self, previous_url, wait=EXPLICITLY_WAIT):
+        """
+        Waits until current url is different than previous_url.
+        :return: new url
+        """
+        return dom_waits.wait_for_url_change(self.driver, previous_url, wait)
+
+    def wait_for_page_ready(self, state='complete', wait=EXPLICITLY_WAIT):
+        """
+        Waits until document.readyState reaches given state: "interactive" or "complete".
+        """
+        return dom_waits.wait_for_document_ready(self.driver, state, wait)
+
+    def wait_for_dom_settled(self, quiet_period=DOM_SETTLED_QUIET_PERIOD, wait=EXPLICITLY_WAIT):
+        """
+        Waits until there were no DOM changes on the page for quiet_period seconds.
+        :return: True if DOM settled before the wait ended
         """
-        url = ""
-        while url == "":
-            url = self.read_page_netloc_from_current_url()
-            self.waits(0.1)
+        return dom_waits.wait_for_dom_settled(self.driver, quiet_period=quiet_period, wait=wait)
 
     # -------------------------------------------------------------------------------------------------------
     # sets
@@ -0,0 +1,85 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.settings.settings import BROWSER_PROFILE
+
+TMPFS_DIR = '/dev/shm'
+
+
+class BrowserProfile(object):
+
+    def __init__(self, headless=False, window_size=None, page_load_strategy='normal', lean=False,
+                 temporary_profile=False):
+        """
+        Set of browser options applied by ChromeBrowser, FirefoxBrowser and EdgeBrowser.
+        :param headless: run browser without a window
+        :param window_size: (width, height) of the window, None to maximize it
+        :param page_load_strategy: "normal" waits for all resources, "eager" for DOMContentLoaded,
+                                    "none" returns right after navigation starts
+        :param lean: disable extensions, GPU, background networking and component updates
+        :param temporary_profile: start with a throwaway profile directory, on tmpfs when it is available
+        """
+        self.headless = headless
+        self.window_size = window_size
+        self.page_load_strategy = page_load_strategy
+        self.lean = lean
+        self.temporary_profile = temporary_profile
+
+    @staticmethod
+    def make_profile_dir():
+        """
+        :return: path to an empty directory which is removed when the run ends at the latest
+        """
+        profile_dir = tempfile.mkdtemp(prefix='browser_profile_', dir=TMPFS_DIR if os.path.isdir(TMPFS_DIR) else None)
+        atexit.register(shutil.rmtree, profile_dir, True)
+        return profile_dir
+
+    @staticmethod
+    def remove_profile_dir_with(driver, profile_dir):
+        """
+        Removes the profile directory as soon as the browser session ends, on quit() or on close() of its last window,
+        so profiles of finished sessions don't fill up the tmpfs (which the browser needs too) during the run.
+        """
+        quit_driver, close_window = driver.quit, driver.close
+
+        def quit_and_remove():
+            try:
+                quit_driver()
+            finally:
+                shutil.rmtree(profile_dir, True)
+
+        def close_and_remove():
+            close_window()
+            try:
+                session_ended = not driver.window_handles
+            except WebDriverException:
+                session_ended = True
+            if session_ended:
+                shutil.rmtree(profile_dir, True)
+
+        driver.quit, driver.close = quit_and_remove, close_and_remove
+
+
+PROFILES = {
+    'default': BrowserProfile(),
+    'performance': BrowserProfile(window_size=(1920, 1080), page_load_strategy='eager', lean=True,
+                                  temporary_profile=True),
+    'headless': BrowserProfile(headless=True, window_size=(1920, 1080), page_load_strategy='eager', lean=True,
+                               temporary_profile=True),
+    'headless_no_wait': BrowserProfile(headless=True, window_size=(1920, 1080), page_load_strategy='none',
+                                       lean=True, temporary_profile=True),
+}
+
+
+def get_profile(name=BROWSER_PROFILE):
+    """
+    :param name: name of the profile, by default taken from BROWSER_PROFILE setting
+    :return: BrowserProfile object
+    """
+    if name not in PROFILES:
+        raise Exception(f"Wrong name of browser profile: {name}. Available profiles: {list(PROFILES)}")
+    return PROFILES[name]
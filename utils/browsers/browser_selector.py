@@ -1,13 +1,23 @@
-from utils.browsers.chrome_browser import ChromeBrowser
-from utils.browsers.edge_browser import EdgeBrowser
-from utils.browsers.firefox_browser import FirefoxBrowser
-from utils.settings.settings import BROWSER
-
-
-def browser():
-    browsers = {
-        'chrome': ChromeBrowser,
-        'firefox': FirefoxBrowser,
-        'edge': EdgeBrowser,
-    }
-    return browsers[BROWSER]()
+import importlib
+
+from utils.settings import settings
+
+# browser name: (module, class), a backend is imported only when it is selected
+BROWSERS = {
+    'chrome': ('utils.browsers.chrome_browser', 'ChromeBrowser'),
+    'firefox': ('utils.browsers.firefox_browser', 'FirefoxBrowser'),
+    'edge': ('utils.browsers.edge_browser', 'EdgeBrowser'),
+    'lxml': ('utils.drivers.lxml_driver', 'LxmlBrowser'),
+}
+
+
+def browser(profile=None):
+    """
+    :param profile: BrowserProfile object, by default the one selected with BROWSER_PROFILE setting
+    """
+    module_name, class_name = BROWSERS[settings.BROWSER]
+    browser_class = getattr(importlib.import_module(module_name), class_name)
+    if settings.BROWSER == 'lxml':
+        # browserless driver has no profiles
+        return browser_class()
+    return browser_class(profile)
@@ -1,24 +1,54 @@
 import os
 
 from selenium import webdriver
-from utils.settings.settings import PATH_TO_PROJECT, DRIVER, IMPLICITLY_WAIT
+from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+
+from utils.browsers.browser_profiles import get_profile
+from utils.browsers.driver_service import SharedServiceChrome
+from utils.settings.settings import PATH_TO_PROJECT, DRIVER, USE_CACHING_PROXY, CACHING_PROXY_ADDRESS, \
+    REUSE_DRIVER_SERVICE
 
 
 class ChromeBrowser:
-    def __init__(self):
+    def __init__(self, profile=None):
+        self.profile = profile or get_profile()
         driver_path = os.path.join(PATH_TO_PROJECT, 'utils', 'drivers', DRIVER)
-        os.chmod(driver_path, 755)
         self.set_up_browser()
-        self.driver = webdriver.Chrome(options=self.options, executable_path=driver_path)
-        if DRIVER == "chromedriver":
+        if REUSE_DRIVER_SERVICE:
+            self.driver = SharedServiceChrome(driver_path, self.options, self.capabilities)
+        else:
+            os.chmod(driver_path, 755)
+            self.driver = webdriver.Chrome(options=self.options, executable_path=driver_path,
+                                           desired_capabilities=self.capabilities)
+        if self.profile.window_size:
+            self.driver.set_window_size(*self.profile.window_size)
+        elif DRIVER == "chromedriver":
             self.driver.fullscreen_window()
-        self.driver.implicitly_wait(IMPLICITLY_WAIT)
+        if self.profile_dir:
+            self.profile.remove_profile_dir_with(self.driver, self.profile_dir)
 
     def set_up_browser(self):
         self.options = webdriver.ChromeOptions()
         self.options.add_argument('--no-sandbox')
-        self.options.add_argument('start-maximized')
         self.options.add_argument('disable-infobars')
+        if self.profile.window_size:
+            self.options.add_argument('--window-size={},{}'.format(*self.profile.window_size))
+        else:
+            self.options.add_argument('start-maximized')
+        if self.profile.headless:
+            self.options.headless = True
+        if self.profile.lean:
+            for argument in ('--disable-extensions', '--disable-gpu', '--disable-background-networking',
+                             '--disable-component-update', '--disable-default-apps', '--disable-sync',
+                             '--no-first-run'):
+                self.options.add_argument(argument)
+        self.profile_dir = self.profile.make_profile_dir() if self.profile.temporary_profile else None
+        if self.profile_dir:
+            self.options.add_argument(f'--user-data-dir={self.profile_dir}')
+        if USE_CACHING_PROXY:
+            self.options.add_argument(f'--proxy-server=http://{CACHING_PROXY_ADDRESS}')
+        self.capabilities = DesiredCapabilities.CHROME.copy()
+        self.capabilities['pageLoadStrategy'] = self.profile.page_load_strategy
 
     def close(self):
         self.driver.close()
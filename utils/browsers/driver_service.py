@@ -0,0 +1,145 @@
+import atexit
+import os
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.webdriver.firefox.remote_connection import FirefoxRemoteConnection
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+
+class DriverService(object):
+
+    def __init__(self, service_class, executable_path):
+        """
+        chromedriver, geckodriver or msedgedriver process started once per process (each parallel worker has its own)
+        and shared by all browser sessions. It is checked before every new session and restarted when it died.
+        :param service_class: selenium Service class of the browser
+        :param executable_path: path to the driver binary
+        """
+        self.service_class = service_class
+        self.executable_path = executable_path
+        self.service = None
+        self.starts = 0
+        self.failed = False
+
+    @property
+    def restarts(self):
+        return max(0, self.starts - 1)
+
+    def is_healthy(self):
+        return (self.service is not None and not self.failed and self.service.process.poll() is None
+                and self.service.is_connectable())
+
+    def mark_unhealthy(self):
+        """
+        The driver process is restarted before the next session, i.e. after it failed to end a session.
+        """
+        self.failed = True
+
+    def url(self):
+        """
+        :return: url of a running driver process, started or restarted when needed
+        """
+        if not self.is_healthy():
+            self.start()
+        return self.service.service_url
+
+    def start(self):
+        self.stop()
+        if self.starts == 0 and os.path.exists(self.executable_path):
+            os.chmod(self.executable_path, 0o755)
+        self.service = self.service_class(self.executable_path)
+        self.service.start()
+        self.starts += 1
+        self.failed = False
+
+    def stop(self):
+        if self.service is not None:
+            self.service.stop()
+            self.service = None
+
+
+_services = {}
+
+
+def driver_service(service_class, executable_path):
+    """
+    :return: DriverService of the driver binary, the same object for the whole process
+    """
+    key = (service_class, executable_path)
+    if key not in _services:
+        _services[key] = DriverService(service_class, executable_path)
+    return _services[key]
+
+
+@atexit.register
+def stop_driver_services():
+    for service in _services.values():
+        service.stop()
+
+
+# -------------------------------------------------------------------------------------------------------
+# drivers opening a session on a shared service, quit() ends the session and keeps the service running
+def quit_session(driver, service):
+    """
+    Ends the session of the driver, the service which failed to end it is restarted before the next session.
+    """
+    try:
+        RemoteWebDriver.quit(driver)
+    except WebDriverException:
+        service.mark_unhealthy()
+
+
+class SharedServiceChrome(webdriver.Chrome):
+
+    def __init__(self, executable_path, options, desired_capabilities):
+        desired_capabilities.update(options.to_capabilities())
+        self.service = driver_service(ChromeService, executable_path)
+        RemoteWebDriver.__init__(
+            self,
+            command_executor=ChromeRemoteConnection(remote_server_addr=self.service.url(), keep_alive=True),
+            desired_capabilities=desired_capabilities)
+        self._is_remote = False
+
+    def quit(self):
+        quit_session(self, self.service)
+
+
+class SharedServiceFirefox(webdriver.Firefox):
+
+    def __init__(self, executable_path, firefox_binary, options, desired_capabilities):
+        self.binary = None
+        self.profile = None
+        self.service = driver_service(FirefoxService, executable_path)
+        options.binary = firefox_binary
+        capabilities = dict(desired_capabilities)
+        capabilities.pop('marionette', None)
+        capabilities.update(options.to_capabilities())
+        RemoteWebDriver.__init__(
+            self,
+            command_executor=FirefoxRemoteConnection(remote_server_addr=self.service.url()),
+            desired_capabilities=capabilities,
+            keep_alive=True)
+        self._is_remote = False
+
+    def quit(self):
+        quit_session(self, self.service)
+
+
+class SharedServiceEdge(webdriver.Edge):
+
+    def __init__(self, executable_path, capabilities):
+        self.edge_service = driver_service(EdgeService, executable_path)
+        RemoteWebDriver.__init__(
+            self,
+            command_executor=RemoteConnection(self.edge_service.url(), resolve_ip=False, keep_alive=True),
+            desired_capabilities=capabilities)
+        self._is_remote = False
+
+    def quit(self):
+        quit_session(self, self.edge_service)
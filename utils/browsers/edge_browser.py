@@ -1,21 +1,37 @@
 import os
 
 from selenium import webdriver
+from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 
-from utils.settings.settings import PATH_TO_PROJECT, DRIVER, IMPLICITLY_WAIT
+from utils.browsers.browser_profiles import get_profile
+from utils.browsers.driver_service import SharedServiceEdge
+from utils.settings.settings import PATH_TO_PROJECT, DRIVER, REUSE_DRIVER_SERVICE
 
 
 class EdgeBrowser:
 
-    def __init__(self):
-        driver_path = ''
-        os.chmod(driver_path, 755)
-        self.driver = webdriver.Edge(executable_path=driver_path, )
+    def __init__(self, profile=None):
+        """
+        Legacy EdgeHTML driver has no command line options,
+        so only page load strategy and window size of the profile are applied.
+        """
+        self.profile = profile or get_profile()
+        capabilities = DesiredCapabilities.EDGE.copy()
+        capabilities['pageLoadStrategy'] = self.profile.page_load_strategy
+        if REUSE_DRIVER_SERVICE:
+            driver_path = os.path.join(PATH_TO_PROJECT, 'utils', 'drivers', DRIVER)
+            self.driver = SharedServiceEdge(driver_path, capabilities)
+        else:
+            driver_path = ''
+            os.chmod(driver_path, 755)
+            self.driver = webdriver.Edge(executable_path=driver_path, capabilities=capabilities)
         self.set_up_browser()
 
     def set_up_browser(self):
-        self.driver.maximize_window()
-        self.driver.implicitly_wait(IMPLICITLY_WAIT)
+        if self.profile.window_size:
+            self.driver.set_window_size(*self.profile.window_size)
+        else:
+            self.driver.maximize_window()
 
     def close(self):
         self.driver.close()
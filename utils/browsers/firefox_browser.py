@@ -1,23 +1,67 @@
 import os
 
 from selenium import webdriver
+from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 
-from utils.settings.settings import PATH_TO_PROJECT, DRIVER, IMPLICITLY_WAIT
+from utils.browsers.browser_profiles import get_profile
+from utils.browsers.driver_service import SharedServiceFirefox
+from utils.browsers.resource_blocking import BlockingRules
+from utils.settings.settings import PATH_TO_PROJECT, DRIVER, USE_CACHING_PROXY, CACHING_PROXY_ADDRESS, \
+    REUSE_DRIVER_SERVICE
+
+LEAN_PREFERENCES = {
+    'extensions.update.enabled': False,
+    'app.update.enabled': False,
+    'app.update.auto': False,
+    'browser.search.update': False,
+    'browser.safebrowsing.malware.enabled': False,
+    'browser.safebrowsing.phishing.enabled': False,
+    'network.prefetch-next': False,
+    'network.dns.disablePrefetch': True,
+    'datareporting.healthreport.uploadEnabled': False,
+    'layers.acceleration.disabled': True,
+}
 
 
 class FirefoxBrowser:
 
-    def __init__(self):
+    def __init__(self, profile=None):
+        self.profile = profile or get_profile()
         firefox_binary = "C:/Program Files/Mozilla Firefox/firefox.exe"
         driver_path = os.path.join(PATH_TO_PROJECT, 'utils', 'drivers', DRIVER)
-        os.chmod(driver_path, 755)
-        self.driver = webdriver.Firefox(executable_path=driver_path, firefox_binary=firefox_binary)
+        self.set_up_options()
+        if REUSE_DRIVER_SERVICE:
+            self.driver = SharedServiceFirefox(driver_path, firefox_binary, self.options, self.capabilities)
+        else:
+            os.chmod(driver_path, 755)
+            self.driver = webdriver.Firefox(executable_path=driver_path, firefox_binary=firefox_binary,
+                                            options=self.options,
+                                            desired_capabilities=self.capabilities)
         self.set_up_browser()
 
+    def set_up_options(self):
+        self.options = webdriver.FirefoxOptions()
+        # geckodriver already starts every session with a fresh temporary profile
+        self.options.headless = self.profile.headless
+        if self.profile.lean:
+            for name, value in LEAN_PREFERENCES.items():
+                self.options.set_preference(name, value)
+        for name, value in BlockingRules.from_setting().firefox_preferences().items():
+            self.options.set_preference(name, value)
+        if USE_CACHING_PROXY:
+            host, _, port = CACHING_PROXY_ADDRESS.partition(':')
+            for scheme in ('http', 'ssl'):
+                self.options.set_preference(f'network.proxy.{scheme}', host)
+                self.options.set_preference(f'network.proxy.{scheme}_port', int(port))
+            self.options.set_preference('network.proxy.type', 1)
+        self.capabilities = DesiredCapabilities.FIREFOX.copy()
+        self.capabilities['pageLoadStrategy'] = self.profile.page_load_strategy
+
     def set_up_browser(self):
-        self.driver.maximize_window()
-        self.driver.implicitly_wait(IMPLICITLY_WAIT)
+        if self.profile.window_size:
+            self.driver.set_window_size(*self.profile.window_size)
+        else:
+            self.driver.maximize_window()
 
     def close(self):
         self.driver.close()
-
@@ -0,0 +1,89 @@
+from utils.settings.settings import BLOCKED_RESOURCES
+
+TAG_PREFIX = 'block_'
+NO_BLOCKING_TAG = 'block_nothing'
+
+RESOURCE_TYPES = {
+    'images': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico*'],
+    'fonts': ['*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*'],
+    'media': ['*.mp4*', '*.webm*', '*.mp3*', '*.ogg*'],
+    'trackers': ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*facebook.net*',
+                 '*connect.facebook.com*', '*hotjar.com*'],
+}
+
+FIREFOX_PREFERENCES = {
+    'images': {'permissions.default.image': 2},
+    'fonts': {'gfx.downloadable_fonts.enabled': False},
+    'media': {'media.autoplay.default': 5, 'media.autoplay.blocking_policy': 2},
+    'trackers': {'privacy.trackingprotection.enabled': True, 'privacy.trackingprotection.socialtracking.enabled': True},
+}
+
+
+class BlockingRules(object):
+
+    def __init__(self, names=()):
+        """
+        Requests which the browser under test should not make.
+        :param names: resource types from RESOURCE_TYPES (images, fonts, media, trackers)
+                      or URL patterns with * wildcards, i.e. "*cdn.example.com/banners/*"
+        """
+        self.resource_types = sorted({name for name in names if name in RESOURCE_TYPES})
+        self.patterns = sorted({name for name in names if name and name not in RESOURCE_TYPES})
+
+    @classmethod
+    def from_setting(cls, value=BLOCKED_RESOURCES):
+        """
+        :param value: comma separated names, i.e. "images,fonts,*ads.example.com*"
+        """
+        return cls(name.strip() for name in value.split(','))
+
+    @classmethod
+    def from_tags(cls, tags, default=None):
+        """
+        Tags @block_images, @block_fonts, @block_media and @block_trackers of a feature or scenario
+        replace the rules from BLOCKED_RESOURCES setting, @block_nothing turns blocking off.
+        :param tags: effective tags of the scenario
+        :param default: rules used when there are no blocking tags
+        """
+        if NO_BLOCKING_TAG in tags:
+            return cls()
+        names = [tag[len(TAG_PREFIX):] for tag in tags if tag.startswith(TAG_PREFIX)]
+        if not names:
+            return default if default is not None else cls.from_setting()
+        return cls(names)
+
+    @property
+    def url_patterns(self):
+        patterns = list(self.patterns)
+        for resource_type in self.resource_types:
+            patterns.extend(RESOURCE_TYPES[resource_type])
+        return patterns
+
+    def firefox_preferences(self):
+        """
+        Firefox cannot block requests by URL pattern, only whole resource types are turned off with preferences.
+        :return: dict of preferences applied when the browser starts
+        """
+        preferences = {}
+        for resource_type in self.resource_types:
+            preferences.update(FIREFOX_PREFERENCES[resource_type])
+        return preferences
+
+    def apply(self, driver):
+        """
+        Applies rules to a running Chrome with DevTools Network.setBlockedURLs.
+        Rules which are already applied to the driver are not sent again.
+        :return: True when the driver supports blocking at runtime
+        """
+        if not hasattr(driver, 'execute_cdp_cmd'):
+            return False
+        patterns = self.url_patterns
+        if getattr(driver, 'blocked_url_patterns', []) == patterns:
+            return True
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        driver.blocked_url_patterns = patterns
+        return True
+
+    def __bool__(self):
+        return bool(self.resource_types or self.patterns)
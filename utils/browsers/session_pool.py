@@ -0,0 +1,186 @@
+import time
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+from utils.browsers.browser_selector import browser
+from utils.element_cache import ElementCache
+from utils.settings.settings import SESSION_POOL_MAX_USES
+
+
+CLEAR_STORAGE = "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+
+
+class PooledSession(object):
+
+    def __init__(self, browser_instance, startup_time):
+        """
+        :param browser_instance: ChromeBrowser, FirefoxBrowser or EdgeBrowser object
+        :param startup_time: how many seconds it took to launch the browser
+        """
+        self.browser = browser_instance
+        self.driver = browser_instance.driver
+        self.startup_time = startup_time
+        self.uses = 0
+        self.origins = set()
+        self._track_origins()
+
+    def _track_origins(self):
+        """
+        Remembers origins of urls opened with driver.get(), their cookies and storage are cleared on reset.
+        """
+        execute = self.driver.execute
+
+        def execute_and_track(driver_command, params=None):
+            if driver_command == Command.GET:
+                self.origins.add(origin_of(params['url']))
+            return execute(driver_command, params)
+
+        self.driver.execute = execute_and_track
+
+
+def origin_of(url):
+    """
+    :return: "scheme://host:port" of http(s) url, None for other urls (about:blank, file://)
+    """
+    parts = urlsplit(url or '')
+    if parts.scheme not in ('http', 'https'):
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class SessionPool(object):
+
+    def __init__(self, browser_factory=browser, max_uses=SESSION_POOL_MAX_USES):
+        """
+        Keeps warm browser sessions between scenarios, so each scenario
+        does not have to pay for launching a new browser.
+        :param browser_factory: callable returning ChromeBrowser, FirefoxBrowser or EdgeBrowser object
+        :param max_uses: after how many scenarios session should be closed and replaced by a new one
+        """
+        self.browser_factory = browser_factory
+        self.max_uses = max_uses
+        self._idle = []
+        self._busy = {}
+        self.started = 0
+        self.reused = 0
+        self.recycled = 0
+        self.startup_time = 0.0
+        self.reset_time = 0.0
+
+    # -------------------------------------------------------------------------------------------------------
+    # sessions
+    def acquire(self):
+        """
+        :return: driver of an idle session or driver of a newly launched browser
+        """
+        if self._idle:
+            session = self._idle.pop()
+            self.reused += 1
+        else:
+            session = self._start_session()
+        session.uses += 1
+        self._busy[id(session.driver)] = session
+        return session.driver
+
+    def release(self, driver, failed=False):
+        """
+        Gives the session back to the pool. Session is closed instead
+        when scenario failed, when it was used max_uses times or when reset did not succeed.
+        :param driver: driver returned by acquire()
+        :param failed: True if scenario that used the driver failed
+        """
+        session = self._busy.pop(id(driver))
+        if failed or session.uses >= self.max_uses or not self.reset(driver, session.origins):
+            self.recycled += 1
+            self._quit(session)
+        else:
+            session.origins.clear()
+            self._idle.append(session)
+
+    def reset(self, driver, origins=()):
+        """
+        Brings the browser back to a clean state: no cookies, no local and session storage of any visited origin,
+        only one tab opened on blank page.
+        Chrome clears all cookies and storage of the origins with DevTools commands, other browsers open
+        each origin to delete its cookies and storage there.
+        :param origins: origins visited by the session, the origin of the current page is always cleared
+        :return: True if reset succeeded
+        """
+        start = time.perf_counter()
+        ElementCache.for_driver(driver).invalidate()
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            driver.execute_script(CLEAR_STORAGE)
+            visited = {origin for origin in set(origins) | {origin_of(driver.current_url)} if origin}
+            if hasattr(driver, 'execute_cdp_cmd'):
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+                for origin in visited:
+                    driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            else:
+                for origin in visited:
+                    driver.get(origin)
+                    driver.delete_all_cookies()
+                    driver.execute_script(CLEAR_STORAGE)
+            driver.get("about:blank")
+        except WebDriverException:
+            return False
+        finally:
+            self.reset_time += time.perf_counter() - start
+        return True
+
+    def close_all(self):
+        """
+        Closes every session that is kept by the pool.
+        """
+        for session in self._idle + list(self._busy.values()):
+            self._quit(session)
+        self._idle = []
+        self._busy = {}
+
+    # -------------------------------------------------------------------------------------------------------
+    # report
+    def average_startup_time(self):
+        """
+        :return: average time in seconds of launching one browser
+        """
+        if not self.started:
+            return 0.0
+        return self.startup_time / self.started
+
+    def saved_time(self):
+        """
+        :return: estimated seconds saved by reusing sessions instead of launching new browsers
+        """
+        return self.reused * self.average_startup_time() - self.reset_time
+
+    def report(self):
+        """
+        :return: a string with summary of pool usage
+        """
+        return (f"Session pool: {self.started} started, {self.reused} reused, {self.recycled} recycled, "
+                f"average startup {self.average_startup_time():.2f}s, total reset {self.reset_time:.2f}s, "
+                f"saved {self.saved_time():.2f}s")
+
+    # -------------------------------------------------------------------------------------------------------
+    # others
+    def _start_session(self):
+        start = time.perf_counter()
+        browser_instance = self.browser_factory()
+        startup_time = time.perf_counter() - start
+        self.started += 1
+        self.startup_time += startup_time
+        return PooledSession(browser_instance, startup_time)
+
+    @staticmethod
+    def _quit(session):
+        try:
+            session.driver.quit()
+        except WebDriverException:
+            pass
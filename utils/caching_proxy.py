@@ -0,0 +1,362 @@
+import hashlib
+import http.client
+import json
+import os
+import select
+import socket
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from utils.settings.settings import CACHING_PROXY_ADDRESS, CACHING_PROXY_DIR, CACHING_PROXY_MAX_SIZE, PATH_TO_PROJECT
+
+STATIC_CONTENT_TYPES = ('text/css', 'javascript', 'image/', 'font/', 'application/font')
+HOP_BY_HOP_HEADERS = ('connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'proxy-connection',
+                      'te', 'trailers', 'transfer-encoding', 'upgrade')
+UPSTREAM_TIMEOUT = 30
+# requested directly (not through the proxy) to recognize a running proxy
+HEALTH_PATH = '/__caching_proxy__/health'
+HEALTH_RESPONSE = b'caching proxy'
+
+
+class CachedResponse(object):
+
+    def __init__(self, status, headers, body, stored_at):
+        """
+        :param headers: dict of response headers with lowercase names
+        :param stored_at: time.time() when the response was received or last revalidated
+        """
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+
+    def freshness_lifetime(self):
+        """
+        :return: seconds the response can be served without asking the server, from Cache-Control or Expires,
+                 0 when the server didn't allow it, so the response is revalidated on every request
+        """
+        directives = {}
+        for directive in self.headers.get('cache-control', '').lower().split(','):
+            name, _, value = directive.strip().partition('=')
+            directives[name] = value.strip('"')
+        if 'no-cache' in directives:
+            return 0
+        for name in ('s-maxage', 'max-age'):
+            if directives.get(name, '').isdigit():
+                return int(directives[name])
+        try:
+            expires = parsedate_to_datetime(self.headers['expires']).timestamp()
+            date = parsedate_to_datetime(self.headers['date']).timestamp() if 'date' in self.headers \
+                else self.stored_at
+        except (KeyError, TypeError, ValueError):
+            return 0
+        return max(0, expires - date)
+
+    def is_fresh(self, now=None):
+        age = (now or time.time()) - self.stored_at
+        if self.headers.get('age', '').isdigit():
+            age += int(self.headers['age'])
+        return age < self.freshness_lifetime()
+
+    def validators(self):
+        """
+        :return: headers of a conditional request, empty when the response can't be revalidated
+        """
+        validators = {}
+        if 'etag' in self.headers:
+            validators['If-None-Match'] = self.headers['etag']
+        if 'last-modified' in self.headers:
+            validators['If-Modified-Since'] = self.headers['last-modified']
+        return validators
+
+
+class DiskCache(object):
+
+    def __init__(self, directory, max_size):
+        """
+        Least recently used cache of responses kept in files, one file per URL.
+        Files are replaced atomically, so one directory can be shared by proxies of many processes.
+        :param directory: directory for cached responses
+        :param max_size: limit of bytes kept on disk, least recently used responses are removed above it
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.entries = OrderedDict()
+        self.size = 0
+        for path in sorted((os.path.join(directory, name) for name in os.listdir(directory)
+                            if name.endswith('.cache')), key=os.path.getatime):
+            self.entries[path] = os.path.getsize(path)
+            self.size += self.entries[path]
+
+    def path_of(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode()).hexdigest() + '.cache')
+
+    def get(self, url):
+        """
+        :return: CachedResponse or None when the url is not cached
+        """
+        path = self.path_of(url)
+        try:
+            with open(path, 'rb') as cache_file:
+                meta = json.loads(cache_file.readline())
+                body = cache_file.read()
+        except (OSError, ValueError):
+            return None
+        with self.lock:
+            if path in self.entries:
+                self.entries.move_to_end(path)
+            else:
+                self.entries[path] = os.path.getsize(path)
+                self.size += self.entries[path]
+        os.utime(path)
+        return CachedResponse(meta['status'], meta['headers'], body, meta.get('stored_at', 0))
+
+    def put(self, url, status, headers, body):
+        path = self.path_of(url)
+        content = json.dumps({'url': url, 'status': status, 'headers': headers,
+                              'stored_at': time.time()}).encode() + b'\n' + body
+        if len(content) > self.max_size:
+            return
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, 'wb') as cache_file:
+            cache_file.write(content)
+        os.replace(temporary_path, path)
+        with self.lock:
+            self.size += len(content) - self.entries.pop(path, 0)
+            self.entries[path] = len(content)
+            while self.size > self.max_size:
+                oldest, oldest_size = self.entries.popitem(last=False)
+                self.size -= oldest_size
+                try:
+                    os.remove(oldest)
+                except FileNotFoundError:
+                    pass
+
+
+class ProxyStatistics(object):
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self.bytes_saved = 0
+
+    def add(self, hit=False, revalidated=False, miss=False, uncacheable=False, bytes_saved=0):
+        with self.lock:
+            self.hits += hit
+            self.revalidated += revalidated
+            self.misses += miss
+            self.uncacheable += uncacheable
+            self.bytes_saved += bytes_saved
+
+    @property
+    def hit_ratio(self):
+        cacheable = self.hits + self.misses
+        return self.hits / cacheable if cacheable else 0.0
+
+
+class CachingProxyHandler(BaseHTTPRequestHandler):
+    cache = None
+    statistics = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        """
+        Cached response is served while it is fresh according to Cache-Control or Expires headers.
+        A stale one is revalidated with If-None-Match/If-Modified-Since and served again when the server
+        answers 304, so new versions of assets are downloaded right after a deploy.
+        """
+        if self.path == HEALTH_PATH:
+            self._respond(200, {'content-type': 'text/plain'}, HEALTH_RESPONSE)
+            return
+        if not self.path.lower().startswith('http://'):
+            self._forward()
+            return
+        cached = self.cache.get(self.path)
+        if cached and cached.is_fresh():
+            self.statistics.add(hit=True, bytes_saved=len(cached.body))
+            self._respond(cached.status, cached.headers, cached.body)
+            return
+        self._forward(cache_response=True, cached=cached)
+
+    def do_HEAD(self):
+        self._forward()
+
+    def do_POST(self):
+        self._forward()
+
+    def do_PUT(self):
+        self._forward()
+
+    def do_DELETE(self):
+        self._forward()
+
+    def do_OPTIONS(self):
+        self._forward()
+
+    def do_CONNECT(self):
+        """
+        HTTPS is tunneled without caching, the proxy cannot see encrypted traffic.
+        """
+        host, _, port = self.path.partition(':')
+        try:
+            upstream = socket.create_connection((host, int(port or 443)), timeout=UPSTREAM_TIMEOUT)
+        except OSError:
+            self.send_error(502)
+            return
+        self.send_response(200, 'Connection Established')
+        self.end_headers()
+        self.statistics.add(uncacheable=True)
+        sockets = [self.connection, upstream]
+        try:
+            while True:
+                readable, _, broken = select.select(sockets, [], sockets, UPSTREAM_TIMEOUT)
+                if broken or not readable:
+                    break
+                for source in readable:
+                    data = source.recv(65536)
+                    if not data:
+                        return
+                    (upstream if source is self.connection else self.connection).sendall(data)
+        except OSError:
+            pass
+        finally:
+            upstream.close()
+            self.close_connection = True
+
+    # -------------------------------------------------------------------------------------------------------
+    # others
+    @staticmethod
+    def _is_cacheable(status, headers):
+        cache_control = headers.get('cache-control', '').lower()
+        content_type = headers.get('content-type', '').lower()
+        return (status == 200 and 'set-cookie' not in headers and 'no-store' not in cache_control
+                and 'private' not in cache_control and any(kind in content_type for kind in STATIC_CONTENT_TYPES))
+
+    def _forward(self, cache_response=False, cached=None):
+        """
+        :param cached: stale CachedResponse of the url, the request is sent as conditional one when it has validators
+        """
+        url = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0) or 0))
+        headers = {name: value for name, value in self.headers.items() if name.lower() not in HOP_BY_HOP_HEADERS}
+        if cached and cached.validators():
+            headers = {name: value for name, value in headers.items()
+                       if name.lower() not in ('if-none-match', 'if-modified-since')}
+            headers.update(cached.validators())
+        connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        connection = connection_class(url.netloc, timeout=UPSTREAM_TIMEOUT)
+        try:
+            connection.request(self.command, url.path + (f"?{url.query}" if url.query else '') or '/',
+                               body=body or None, headers=headers)
+            response = connection.getresponse()
+            response_body = response.read()
+        except OSError:
+            self.send_error(502)
+            return
+        finally:
+            connection.close()
+        response_headers = {name.lower(): value for name, value in response.getheaders()
+                            if name.lower() not in HOP_BY_HOP_HEADERS and name.lower() != 'content-length'}
+        if cached and cached.validators() and response.status == 304:
+            revalidated_headers = dict(cached.headers, **response_headers)
+            self.cache.put(self.path, cached.status, revalidated_headers, cached.body)
+            self.statistics.add(hit=True, revalidated=True, bytes_saved=len(cached.body))
+            self._respond(cached.status, revalidated_headers, cached.body)
+            return
+        if cache_response and self._is_cacheable(response.status, response_headers):
+            self.cache.put(self.path, response.status, response_headers, response_body)
+            self.statistics.add(miss=True)
+        else:
+            self.statistics.add(uncacheable=True)
+        self._respond(response.status, response_headers, response_body, head=self.command == 'HEAD')
+
+    def _respond(self, status, headers, body, head=False):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+
+class CachingProxy(object):
+
+    def __init__(self, address=CACHING_PROXY_ADDRESS, cache_dir=CACHING_PROXY_DIR, max_size=CACHING_PROXY_MAX_SIZE):
+        """
+        Forward HTTP proxy which keeps static assets (css, js, images, fonts) of the site under test on disk,
+        so every browser session and every parallel worker downloads them only once.
+        :param address: "host:port" to listen on
+        :param cache_dir: directory of the cache, .proxy_cache in the project by default
+        :param max_size: limit of the cache in megabytes
+        """
+        host, _, port = address.partition(':')
+        self.cache = DiskCache(cache_dir or os.path.join(PATH_TO_PROJECT, '.proxy_cache'), int(max_size * 1024 * 1024))
+        self.statistics = ProxyStatistics()
+        handler = type('Handler', (CachingProxyHandler,), {'cache': self.cache, 'statistics': self.statistics})
+        self.server = ThreadingHTTPServer((host, int(port)), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @classmethod
+    def start_if_not_running(cls, address=CACHING_PROXY_ADDRESS):
+        """
+        Parallel runner starts one proxy for all workers, so workers find the address already in use.
+        :return: started CachingProxy or None when a caching proxy of another process already listens on the address
+        """
+        try:
+            return cls(address).start()
+        except OSError:
+            if cls.is_running(address):
+                return None
+            raise Exception(f"Address {address} of the caching proxy is used by another program, "
+                            f"browsers would send their traffic to it. Set CACHING_PROXY_ADDRESS to a free address.")
+
+    @staticmethod
+    def is_running(address=CACHING_PROXY_ADDRESS):
+        """
+        :return: True when a CachingProxy listens on the address
+        """
+        host, _, port = address.partition(':')
+        connection = http.client.HTTPConnection(host, int(port), timeout=2)
+        try:
+            connection.request('GET', HEALTH_PATH)
+            response = connection.getresponse()
+            return response.status == 200 and response.read() == HEALTH_RESPONSE
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            connection.close()
+
+    @property
+    def address(self):
+        host, port = self.server.server_address
+        return f"{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def report(self):
+        statistics = self.statistics
+        return (f"Caching proxy: {statistics.hits} hits ({statistics.revalidated} revalidated), "
+                f"{statistics.misses} misses, "
+                f"{statistics.uncacheable} not cached, hit ratio {statistics.hit_ratio:.1%}, "
+                f"{statistics.bytes_saved / 1024 / 1024:.2f}MB saved, "
+                f"cache size {self.cache.size / 1024 / 1024:.2f}MB")
@@ -0,0 +1,143 @@
+import itertools
+import json
+import os
+import re
+import time
+
+from selenium.webdriver.remote.webelement import WebElement
+
+W3C_ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+
+class CommandTracer(object):
+
+    def __init__(self, output_dir):
+        """
+        Times every WebDriver command sent by the driver it is installed on
+        and attributes it to the current behave scenario and step.
+        Records of each scenario are written to output_dir as JSON lines.
+        :param output_dir: directory for <number of the scenario in the run>_<scenario>.jsonl files
+        """
+        self.output_dir = output_dir
+        self.scenario = None
+        self.step = None
+        self.records = []
+        self.all_records = []
+        self._element_locators = {}
+        self.sequence = itertools.count(1)
+
+    def install(self, driver):
+        """
+        Wraps driver.execute, which is used by the driver and by all its elements to send commands.
+        Installing the tracer again on the same driver does nothing.
+        """
+        if getattr(driver, 'command_tracer', None) is self:
+            return driver
+        execute = driver.execute
+
+        def traced_execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return_value = execute(driver_command, params)
+            except Exception:
+                self._add_record(driver_command, params, time.perf_counter() - start, None, failed=True)
+                raise
+            self._add_record(driver_command, params, time.perf_counter() - start, return_value)
+            return return_value
+
+        driver.execute = traced_execute
+        driver.command_tracer = self
+        return driver
+
+    # -------------------------------------------------------------------------------------------------------
+    # behave hooks
+    def start_scenario(self, feature_name, scenario_name):
+        self.scenario = f"{feature_name}: {scenario_name}"
+        self.step = None
+        self.records = []
+        self._element_locators = {}
+
+    def start_step(self, step_name):
+        self.step = step_name
+
+    def finish_step(self):
+        self.step = None
+
+    def finish_scenario(self):
+        """
+        Writes records of the scenario to a JSON lines file.
+        Its name starts with the number of the scenario in the run, so scenario outline examples
+        and scenarios with the same name don't overwrite each other's traces.
+        :return: path to the file
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        file_name = f"{next(self.sequence):04d}_" \
+            + re.sub(r'\W+', '_', self.scenario or 'no_scenario').strip('_') + '.jsonl'
+        path = os.path.join(self.output_dir, file_name)
+        with open(path, 'w') as trace_file:
+            for record in self.records:
+                trace_file.write(json.dumps(record) + '\n')
+        self.all_records.extend(self.records)
+        self.records = []
+        return path
+
+    # -------------------------------------------------------------------------------------------------------
+    # summary
+    def summary(self, top=10):
+        """
+        :param top: how many commands and locators should be listed
+        :return: a string with slowest commands and locators of the whole run
+        """
+        records = self.all_records + self.records
+        lines = [f"WebDriver commands: {len(records)}, total {sum(r['latency'] for r in records):.3f}s"]
+        for title, key in (("Slowest commands", 'command'), ("Slowest locators", 'locator')):
+            lines.append(f"{title} (total time):")
+            for name, count, total in self._group(records, key)[:top]:
+                lines.append(f"  {total:.3f}s {count}x {name}")
+        lines.append("Slowest single commands:")
+        for record in sorted(records, key=lambda r: -r['latency'])[:top]:
+            lines.append(f"  {record['latency']:.3f}s {record['command']} {record['locator'] or ''} "
+                         f"[{record['scenario']} / {record['step']}]")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _group(records, key):
+        groups = {}
+        for record in records:
+            if record[key] is None:
+                continue
+            count, total = groups.get(record[key], (0, 0.0))
+            groups[record[key]] = (count + 1, total + record['latency'])
+        return sorted(((name, count, total) for name, (count, total) in groups.items()), key=lambda g: -g[2])
+
+    # -------------------------------------------------------------------------------------------------------
+    # others
+    def _add_record(self, driver_command, params, latency, return_value, failed=False):
+        params = params or {}
+        locator = self._locator_of(params)
+        if return_value and locator and params.get('using'):
+            for element_id in self._element_ids(return_value.get('value')):
+                self._element_locators[element_id] = locator
+        self.records.append({
+            'scenario': self.scenario,
+            'step': self.step,
+            'command': driver_command,
+            'locator': locator,
+            'payload_size': len(json.dumps(params, default=str)),
+            'latency': latency,
+            'failed': failed,
+        })
+
+    def _locator_of(self, params):
+        if 'using' in params:
+            return f"{params['using']}={params.get('value')}"
+        return self._element_locators.get(params.get('id'))
+
+    @staticmethod
+    def _element_ids(value):
+        values = value if isinstance(value, list) else [value]
+        for item in values:
+            if isinstance(item, WebElement):
+                yield item.id
+            elif isinstance(item, dict) and (item.get(W3C_ELEMENT_KEY) or item.get('ELEMENT')):
+                yield item.get(W3C_ELEMENT_KEY) or item.get('ELEMENT')
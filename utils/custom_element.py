@@ -1,19 +1,19 @@
-import time
-
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as ec
-from selenium.webdriver.support.wait import WebDriverWait
 
+from utils import dom_waits, js_scripts
 from utils.helpers import Helpers
 from utils.settings.local_settings import EXPLICITLY_WAIT
-from utils.settings.settings import LOCATOR_SEARCHING_METHOD
+from utils.settings.settings import LOCATOR_SEARCHING_METHOD, IMPLICITLY_WAIT
+from utils.wait_engine import LocatorCondition, wait_engine
 
 
 class CustomElement(WebElement):
     def __init__(self, driver, locator=None, locator_type=LOCATOR_SEARCHING_METHOD, wait=EXPLICITLY_WAIT, element_id=None,
-                 w3c=False, is_visible=True):
+                 w3c=False, is_visible=True, lazy=False):
         """
         :param driver: driver
         :param locator: "div[class*='something']"
@@ -22,30 +22,120 @@ class CustomElement(WebElement):
                             you can put it here to convert to CustomElement object
         :param is_visible: true will cause that WebDriverWait will be looking for visible element,
                             with false WebdriverWait will be looking for element located in DOM
+        :param lazy: true will cause that element is not searched for until first command is sent to it
         """
-        if locator and is_visible is False:
-            element = WebDriverWait(driver, wait).until(
-                ec.presence_of_element_located((locator_type, locator)))
-            id_ = element.id
-        elif locator:
-            element = WebDriverWait(driver, wait).until(
-                ec.visibility_of_element_located((locator_type, locator)))
-            id_ = element.id
+        if locator and not lazy:
+            id_ = self._locate(driver, locator, locator_type, wait, is_visible).id
         else:
             id_ = element_id
         super().__init__(driver, id_, w3c)
         if not element_id:
             self.locator_type = locator_type
             self.locator = locator
+        else:
+            self.locator_type = None
+            self.locator = None
+        self.wait = wait
+        self.is_visible = is_visible
         self.driver = driver
 
+    @staticmethod
+    def _locate(driver, locator, locator_type, wait, is_visible):
+        if is_visible is False:
+            return wait_engine.until(driver, ec.presence_of_element_located((locator_type, locator)), wait)
+        return wait_engine.until(driver, ec.visibility_of_element_located((locator_type, locator)), wait)
+
+    def _resolve(self):
+        self._id = self._locate(self.driver, self.locator, self.locator_type, self.wait, self.is_visible).id
+
+    @property
+    def id(self):
+        """
+        Lazy element is searched for when its id is needed for the first time.
+        """
+        if self._id is None and self.locator:
+            self._resolve()
+        return self._id
+
+    def _execute(self, command, params=None):
+        """
+        Element found by locator is found again when it went stale, i.e. after page re-render,
+        so a cached CustomElement object can still be used.
+        """
+        if self._id is None and self.locator:
+            self._resolve()
+        try:
+            return super()._execute(command, params)
+        except StaleElementReferenceException:
+            if not self.locator:
+                raise
+            self._resolve()
+            return super()._execute(command, params)
+
+    def is_present(self, wait=0):
+        """
+        Checks if element defined by locator is in DOM, without waiting out the whole explicit wait.
+        :param wait: how many seconds at most to wait for the element, 0 means checking only once
+        :return: True if element is present
+        """
+        return self._check_presence('present', wait)
+
+    def exists(self, wait=0):
+        """
+        Same as is_present, but when element was created with is_visible=True it also has to be visible.
+        :param wait: how many seconds at most to wait for the element, 0 means checking only once
+        :return: True if element exists
+        """
+        return self._check_presence('visible' if self.is_visible else 'present', wait)
+
+    def _check_presence(self, state, wait):
+        if self.locator and not Helpers.is_script_locator_supported(self.locator_type):
+            # in-browser scripts can't search by link text, elements are found with find_elements instead
+            def check(driver):
+                try:
+                    elements = driver.find_elements(self.locator_type, self.locator)
+                    return any(element.is_displayed() for element in elements) if state == 'visible' \
+                        else bool(elements)
+                except StaleElementReferenceException:
+                    return False
+        elif self.locator:
+            locator, is_xpath = Helpers.get_script_locator(self.locator, self.locator_type)
+
+            def check(driver):
+                return driver.execute_script(js_scripts.ELEMENT_PRESENCE, locator, is_xpath)[state]
+        else:
+            # element created from element_id has no locator to search for, so the element itself is checked
+            def check(driver):
+                try:
+                    return self.is_displayed() if state == 'visible' else bool(self.tag_name)
+                except StaleElementReferenceException:
+                    return False
+
+        if not wait:
+            return check(self.driver)
+        try:
+            return wait_engine.until(self.driver, check, wait)
+        except TimeoutException:
+            return False
+
+    def _as_web_element(self):
+        """
+        :return: plain WebElement with the same id, which is not found again when it goes stale
+        """
+        return WebElement(self.parent, self.id, self._w3c)
+
     def get_inner_element(self, locator, locator_type=LOCATOR_SEARCHING_METHOD):
         """
         :param locator: locator of inner element
         :param locator_type: locator type of inner element
         :return: element(CustomElement object) that is inside parent element
         """
-        element = self.find_element(locator_type, locator)
+        inner_element_located = LocatorCondition((locator_type, locator),
+                                                 lambda parent: parent.find_element(locator_type, locator))
+        try:
+            element = wait_engine.until(self, inner_element_located, IMPLICITLY_WAIT, name='inner_element_located')
+        except TimeoutException:
+            raise NoSuchElementException(f"Unable to locate inner element {locator} within {IMPLICITLY_WAIT} seconds")
         return CustomElement(self.driver, element_id=element.id)
 
     def get_inner_elements_list(self, locator, locator_type=LOCATOR_SEARCHING_METHOD):
@@ -56,7 +146,13 @@ class CustomElement(WebElement):
         :param locator_type: locator type of inner element
         :return: list of elements(ElementsList object) that are inside parent element
         """
-        return self.find_elements(locator_type, locator)
+        inner_elements_located = LocatorCondition((locator_type, locator),
+                                                  lambda parent: parent.find_elements(locator_type, locator),
+                                                  single=False)
+        try:
+            return wait_engine.until(self, inner_elements_located, IMPLICITLY_WAIT, name='inner_elements_located')
+        except TimeoutException:
+            return []
 
     def multiple_click(self, how_many_clicks):
         """
@@ -73,51 +169,49 @@ class CustomElement(WebElement):
         Method that waits until the element will be clickable.
         :return: self
         """
-        element = WebDriverWait(self.driver, wait).until(
-            ec.element_to_be_clickable((self.locator_type, self.locator)))
+        element = wait_engine.until(self.driver, ec.element_to_be_clickable((self.locator_type, self.locator)), wait)
         return CustomElement(self.driver, element_id=element.id)
 
     def delayed_wait_for_visibility(self, seconds=1, wait=EXPLICITLY_WAIT):
         """
-        Method that waits fixed amount of time and then waits
-        for a visible element based on original locator.
-        :param seconds: amount of time in seconds to wait
+        Method that waits until elements of original locator stop changing in DOM
+        and then waits for a visible element based on original locator.
+        :param seconds: maximum amount of time in seconds to wait for DOM to settle
         :return: visible element based on original locator
         """
-        time.sleep(seconds)
-        element = WebDriverWait(self.driver, wait).until(
-            ec.visibility_of_element_located((self.locator_type, self.locator)))
+        dom_waits.wait_for_elements_count_settled(self.driver, self.locator, self.locator_type, wait=seconds)
+        element = wait_engine.until(
+            self.driver, ec.visibility_of_element_located((self.locator_type, self.locator)), wait)
         return CustomElement(self.driver, element_id=element.id)
 
     def delayed_wait_for_visibility_of_element(self, seconds=1, wait=EXPLICITLY_WAIT):
         """
-        Method that waits fixed amount of time and then waits
-        for a visible element based on an element id.
-        :param seconds: amount of time in seconds to wait
+        Method that waits until there are no DOM changes inside the element
+        and then waits for a visible element based on an element id.
+        :param seconds: maximum amount of time in seconds to wait for DOM to settle
         :return: visible element based on an element id
         """
-        time.sleep(seconds)
-        return WebDriverWait(self.parent, wait).until(ec.visibility_of(self))
+        dom_waits.wait_for_dom_settled(self.driver, self, wait=seconds)
+        return wait_engine.until(self.parent, ec.visibility_of(self), wait)
 
     def wait_for_invisibility_of_element(self, wait=EXPLICITLY_WAIT):
         """
         Wait until previously found element become invisible based on element itself.
         """
-        WebDriverWait(self.driver, wait).until(ec.invisibility_of_element(self))
+        wait_engine.until(self.driver, ec.invisibility_of_element(self._as_web_element()), wait)
 
     def wait_for_invisibility_of_locator(self, wait=EXPLICITLY_WAIT):
         """
         Wait until previously found element become invisible
         based on locator used previously to find origin element.
         """
-        WebDriverWait(self.driver, wait).until(
-            ec.invisibility_of_element_located((self.locator_type, self.locator)))
+        wait_engine.until(self.driver, ec.invisibility_of_element_located((self.locator_type, self.locator)), wait)
 
     def wait_for_staleness(self, wait=EXPLICITLY_WAIT):
         """
         Wait until previously found element is no longer attached to the DOM
         """
-        WebDriverWait(self.driver, wait).until(ec.staleness_of(self))
+        wait_engine.until(self.driver, ec.staleness_of(self._as_web_element()), wait)
 
     def send_keys_with_clear(self, text):
         """
@@ -0,0 +1,128 @@
+import time
+import weakref
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+
+from utils import js_scripts
+from utils.helpers import Helpers
+from utils.settings.local_settings import EXPLICITLY_WAIT
+from utils.settings.settings import DOM_SETTLED_QUIET_PERIOD
+from utils.wait_engine import wait_engine
+
+_script_timeouts = weakref.WeakKeyDictionary()
+
+
+def _ensure_script_timeout(driver, wait):
+    """
+    Script timeout of the driver is raised once, when it is shorter than the in-browser wait.
+    """
+    if _script_timeouts.get(driver, 0) < wait + 1:
+        driver.set_script_timeout(wait + 1)
+        _script_timeouts[driver] = wait + 1
+
+
+def _execute_async(driver, name, script, wait, *args):
+    """
+    Executes in-browser wait and records its time in wait engine statistics.
+    """
+    _ensure_script_timeout(driver, wait)
+    start = time.perf_counter()
+    result = driver.execute_async_script(script, *args, int(wait * 1000))
+    wait_engine.record(name, time.perf_counter() - start, polls=1, timed_out=not result['settled'])
+    return result
+
+
+def wait_for_elements_count_settled(driver, locator, locator_type, visible_only=True,
+                                    quiet_period=DOM_SETTLED_QUIET_PERIOD, wait=EXPLICITLY_WAIT):
+    """
+    Waits until number of elements found by locator stops changing for quiet_period seconds.
+    Returns as soon as the list is settled, so there is no need to sleep while list is being rendered.
+    :param visible_only: if True only visible elements are counted
+    :param quiet_period: for how many seconds number of elements can't change
+    :param wait: how many seconds at most to wait, when list is still changing after that it is not an error
+    :return: number of elements
+    """
+    if not Helpers.is_script_locator_supported(locator_type):
+        return _poll_elements_count_settled(driver, locator, locator_type, visible_only, quiet_period, wait)
+    script_locator, is_xpath = Helpers.get_script_locator(locator, locator_type)
+    result = _execute_async(driver, 'elements_count_settled', js_scripts.NODE_COUNT_SETTLED, wait,
+                            script_locator, is_xpath, visible_only, int(quiet_period * 1000))
+    return result['count']
+
+
+def _poll_elements_count_settled(driver, locator, locator_type, visible_only, quiet_period, wait):
+    """
+    Same as wait_for_elements_count_settled for locator types in-browser scripts can't search by (i.e. link text),
+    number of elements is polled with find_elements by wait engine.
+    """
+    state = {'count': None, 'since': None}
+
+    def count_settled(web_driver):
+        try:
+            elements = web_driver.find_elements(locator_type, locator)
+            count = sum(1 for element in elements if element.is_displayed()) if visible_only else len(elements)
+        except StaleElementReferenceException:
+            count = None
+        now = time.perf_counter()
+        if count is None or count != state['count']:
+            state['count'], state['since'] = count, now
+        return count is not None and now - state['since'] >= quiet_period
+
+    try:
+        wait_engine.until(driver, count_settled, wait, name='elements_count_settled')
+    except TimeoutException:
+        pass
+    return state['count'] or 0
+
+
+def wait_for_dom_settled(driver, element=None, quiet_period=DOM_SETTLED_QUIET_PERIOD, wait=EXPLICITLY_WAIT):
+    """
+    Waits until there were no DOM changes inside the element (or whole document) for quiet_period seconds.
+    :param element: element to observe, None to observe whole document
+    :return: True if DOM settled before the wait ended
+    """
+    result = _execute_async(driver, 'dom_settled', js_scripts.MUTATIONS_SETTLED, wait,
+                            element, int(quiet_period * 1000))
+    return result['settled']
+
+
+def wait_for_document_ready(driver, state='complete', wait=EXPLICITLY_WAIT):
+    """
+    Waits until document.readyState reaches given state.
+    When page is replaced during the wait, the check is repeated on the new page.
+    :param state: "interactive" or "complete"
+    """
+    def is_ready(web_driver):
+        try:
+            return web_driver.execute_async_script(js_scripts.DOCUMENT_READY, state, int(wait * 1000))
+        except WebDriverException:
+            return False
+
+    _ensure_script_timeout(driver, wait)
+    return wait_engine.until(driver, is_ready, wait, name='document_ready')
+
+
+def wait_for_url_change(driver, previous_url, wait=EXPLICITLY_WAIT):
+    """
+    Waits until current url is different than previous_url.
+    Document is unloaded on navigation, so this is polled by wait engine instead of waiting in the browser.
+    :return: new url
+    """
+    def changed_url(web_driver):
+        url = web_driver.current_url
+        return url if url != previous_url else None
+
+    return wait_engine.until(driver, changed_url, wait, name='url_change')
+
+
+def wait_for_netloc(driver, wait=EXPLICITLY_WAIT):
+    """
+    Waits until current url has netloc, i.e. page is no longer "about:blank" or "data:,".
+    :return: current url
+    """
+    def url_with_netloc(web_driver):
+        url = web_driver.current_url
+        return url if urlparse(url).netloc else None
+
+    return wait_engine.until(driver, url_with_netloc, wait, name='url_to_appear')
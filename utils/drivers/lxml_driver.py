@@ -0,0 +1,331 @@
+import os
+import re
+import uuid
+from urllib.parse import urljoin, urlparse
+from urllib.request import url2pathname, urlopen
+
+from lxml import html
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils import js_scripts
+
+# 1x1 transparent png returned as a screenshot
+EMPTY_PNG = 'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII='
+NOT_RENDERED_TAGS = ('head', 'script', 'style', 'meta', 'title', 'link', 'noscript', 'template')
+BOOLEAN_ATTRIBUTES = ('checked', 'disabled', 'hidden', 'multiple', 'readonly', 'required', 'selected')
+HIDDEN_CLASSES = ('unvisible', 'hidden')
+BLOCK_TAGS = ('address', 'article', 'aside', 'br', 'dd', 'div', 'dl', 'dt', 'footer', 'form', 'h1', 'h2', 'h3', 'h4',
+              'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'tr', 'ul')
+ELEMENT_KEY = 'ELEMENT'
+
+
+class LxmlDocument(object):
+
+    def __init__(self, url, source, hidden_classes=HIDDEN_CLASSES):
+        """
+        Static DOM of one page with simplified visibility model: element is hidden when it or any of its ancestors
+        is not rendered tag, has hidden attribute, display:none or visibility:hidden style, or one of hidden_classes.
+        """
+        self.url = url
+        self.source = source
+        self.root = html.document_fromstring(source) if source.strip() else html.document_fromstring('<html/>')
+        self.hidden_classes = hidden_classes
+        self._ids = {}
+        self._elements = {}
+
+    # -------------------------------------------------------------------------------------------------------
+    # elements
+    def reference(self, element):
+        if element not in self._ids:
+            element_id = uuid.uuid4().hex
+            self._ids[element] = element_id
+            self._elements[element_id] = element
+        return {ELEMENT_KEY: self._ids[element]}
+
+    def element(self, element_id):
+        if element_id not in self._elements:
+            raise StaleElementReferenceException(f"Element {element_id} is not attached to the current page")
+        return self._elements[element_id]
+
+    def find(self, using, value, parent=None):
+        """
+        :return: list of lxml elements found by locator, inside parent element when it is given
+        """
+        context = self.root if parent is None else parent
+        if using == By.XPATH:
+            found = context.xpath(value)
+        elif using == By.CSS_SELECTOR:
+            found = context.cssselect(value)
+        elif using == By.ID:
+            found = context.xpath('.//*[@id=$value]', value=value)
+        elif using == By.NAME:
+            found = context.xpath('.//*[@name=$value]', value=value)
+        elif using == By.CLASS_NAME:
+            found = context.cssselect(f".{value}")
+        elif using == By.TAG_NAME:
+            found = context.iter(value)
+        elif using in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+            found = [link for link in context.iter('a')
+                     if (value in self.text(link) if using == By.PARTIAL_LINK_TEXT else self.text(link) == value)]
+        else:
+            raise WebDriverException(f"Locator type {using} is not supported by LxmlDriver")
+        return [element for element in found if isinstance(element, html.HtmlElement) and element is not parent]
+
+    # -------------------------------------------------------------------------------------------------------
+    # element state
+    def is_displayed(self, element):
+        for node in [element] + list(element.iterancestors()):
+            style = re.sub(r'\s+', '', node.get('style', '')).lower()
+            if (node.tag in NOT_RENDERED_TAGS or node.get('hidden') is not None
+                    or 'display:none' in style or 'visibility:hidden' in style
+                    or (node.tag == 'input' and node.get('type', '').lower() == 'hidden')
+                    or set(node.get('class', '').split()) & set(self.hidden_classes)):
+                return False
+        return True
+
+    def text(self, element):
+        """
+        :return: visible text of the element with whitespaces collapsed, like element.text in a browser
+        """
+        if not self.is_displayed(element):
+            return ''
+        parts = [element.text or '']
+        for child in element:
+            if isinstance(child, html.HtmlElement) and self.is_displayed(child):
+                block = child.tag in BLOCK_TAGS
+                parts.extend(['\n', self.text(child), '\n'] if block else [self.text(child)])
+            parts.append(child.tail or '')
+        lines = (re.sub(r'\s+', ' ', line).strip() for line in ''.join(
+            part if part == '\n' else re.sub(r'\s+', ' ', part) for part in parts).split('\n'))
+        return '\n'.join(line for line in lines if line)
+
+    def attribute(self, element, name):
+        """
+        :return: attribute value like WebElement.get_attribute(): "true"/None for boolean attributes,
+                    absolute url for href and src
+        """
+        if name.lower() in BOOLEAN_ATTRIBUTES:
+            return 'true' if element.get(name) is not None else None
+        value = element.get(name)
+        if value is not None and name.lower() in ('href', 'src'):
+            return urljoin(self.url, value)
+        return value
+
+
+class LxmlCommandExecutor(object):
+
+    def __init__(self, hidden_classes=HIDDEN_CLASSES):
+        """
+        Answers WebDriver commands in process, on html parsed with lxml.
+        Used as command_executor of LxmlDriver, in place of RemoteConnection.
+        """
+        self.hidden_classes = hidden_classes
+        self.document = LxmlDocument('about:blank', '', hidden_classes)
+        self.history = []
+        self.cookies = {}
+        self.storage = {'local': {}, 'session': {}}
+        self.handlers = {
+            Command.GET: lambda params: self.open(params['url']),
+            Command.GET_CURRENT_URL: lambda params: self.document.url,
+            Command.GET_TITLE: lambda params: self.document.root.findtext('.//title') or '',
+            Command.GET_PAGE_SOURCE: lambda params: self.document.source,
+            Command.REFRESH: lambda params: self.open(self.document.url, remember=False),
+            Command.GO_BACK: lambda params: self.back(),
+            Command.FIND_ELEMENT: lambda params: self.find_one(params),
+            Command.FIND_ELEMENTS: lambda params: self.find_all(params),
+            Command.FIND_CHILD_ELEMENT: lambda params: self.find_one(params, self.element(params)),
+            Command.FIND_CHILD_ELEMENTS: lambda params: self.find_all(params, self.element(params)),
+            Command.GET_ELEMENT_TEXT: lambda params: self.document.text(self.element(params)),
+            Command.GET_ELEMENT_ATTRIBUTE: lambda params: self.document.attribute(self.element(params),
+                                                                                  params['name']),
+            Command.GET_ELEMENT_PROPERTY: lambda params: self.document.attribute(self.element(params),
+                                                                                 params['name']),
+            Command.GET_ELEMENT_TAG_NAME: lambda params: self.element(params).tag,
+            Command.IS_ELEMENT_DISPLAYED: lambda params: self.document.is_displayed(self.element(params)),
+            Command.IS_ELEMENT_ENABLED: lambda params: self.element(params).get('disabled') is None,
+            Command.IS_ELEMENT_SELECTED: lambda params: (self.element(params).get('checked') is not None
+                                                         or self.element(params).get('selected') is not None),
+            Command.CLICK_ELEMENT: lambda params: self.click(self.element(params)),
+            Command.CLEAR_ELEMENT: lambda params: self.element(params).set('value', ''),
+            Command.SEND_KEYS_TO_ELEMENT: lambda params: self.send_keys(self.element(params), params),
+            Command.EXECUTE_SCRIPT: lambda params: self.execute_script(params['script'], params['args']),
+            Command.EXECUTE_ASYNC_SCRIPT: lambda params: self.execute_async_script(params['script']),
+            Command.GET_WINDOW_HANDLES: lambda params: ['lxml'],
+            Command.GET_CURRENT_WINDOW_HANDLE: lambda params: 'lxml',
+            Command.GET_ALL_COOKIES: lambda params: list(self.cookies.values()),
+            Command.ADD_COOKIE: lambda params: self.cookies.update({params['cookie']['name']: params['cookie']}),
+            Command.DELETE_ALL_COOKIES: lambda params: self.cookies.clear(),
+            Command.SCREENSHOT: lambda params: EMPTY_PNG,
+        }
+        for command in (Command.QUIT, Command.CLOSE, Command.SWITCH_TO_WINDOW, Command.IMPLICIT_WAIT,
+                        Command.SET_SCRIPT_TIMEOUT, Command.SET_TIMEOUTS,
+                        Command.MAXIMIZE_WINDOW, Command.FULLSCREEN_WINDOW, Command.SET_WINDOW_SIZE):
+            self.handlers[command] = lambda params: None
+
+    def execute(self, command, params):
+        if command == Command.NEW_SESSION:
+            # status in the response makes selenium talk to LxmlDriver with JSON wire protocol commands
+            return {'status': 0, 'sessionId': uuid.uuid4().hex, 'value': {'browserName': 'lxml'}}
+        if command not in self.handlers:
+            raise WebDriverException(f"Command {command} is not supported by LxmlDriver")
+        return {'status': 0, 'value': self.handlers[command](params)}
+
+    # -------------------------------------------------------------------------------------------------------
+    # navigation
+    def open(self, url, remember=True):
+        """
+        Loads html from a file path, file:// or http(s):// url. Page which can't be loaded is empty, like an error page.
+        """
+        parsed_url = urlparse(url)
+        if not parsed_url.scheme:
+            url = 'file://' + os.path.abspath(url)
+            parsed_url = urlparse(url)
+        try:
+            if parsed_url.scheme == 'file':
+                with open(url2pathname(parsed_url.path), encoding='utf-8') as html_file:
+                    source = html_file.read()
+            elif parsed_url.scheme in ('http', 'https'):
+                with urlopen(url) as response:
+                    source = response.read().decode(response.headers.get_content_charset() or 'utf-8')
+            else:
+                source = ''
+        except OSError:
+            source = ''
+        if remember:
+            self.history.append(self.document.url)
+        self.document = LxmlDocument(url, source, self.hidden_classes)
+
+    def back(self):
+        if self.history:
+            self.open(self.history.pop(), remember=False)
+
+    # -------------------------------------------------------------------------------------------------------
+    # elements
+    def element(self, params):
+        return self.document.element(params['id'])
+
+    def find_all(self, params, parent=None):
+        return [self.document.reference(element)
+                for element in self.document.find(params['using'], params['value'], parent)]
+
+    def find_one(self, params, parent=None):
+        found = self.document.find(params['using'], params['value'], parent)
+        if not found:
+            raise NoSuchElementException(f"Unable to locate element: {params['using']}={params['value']}")
+        return self.document.reference(found[0])
+
+    def click(self, element):
+        if element.tag == 'a' and element.get('href') and not element.get('href').startswith('#'):
+            self.open(urljoin(self.document.url, element.get('href')))
+
+    @staticmethod
+    def send_keys(element, params):
+        element.set('value', (element.get('value') or '') + ''.join(params.get('value', [])))
+
+    # -------------------------------------------------------------------------------------------------------
+    # scripts
+    def execute_script(self, script, args):
+        """
+        Only scripts from utils.js_scripts and scrolling are supported, they are run in Python on lxml tree.
+        """
+        document = self.document
+        elements = [document.element(arg[ELEMENT_KEY]) for arg in args[0]] \
+            if args and isinstance(args[0], list) else []
+        if script == js_scripts.BULK_TEXTS:
+            return [document.text(element) for element in elements]
+        if script in (js_scripts.BULK_ATTRIBUTES, js_scripts.BULK_PROPERTIES):
+            return [document.attribute(element, args[1]) for element in elements]
+        if script == js_scripts.BULK_VISIBILITY:
+            return [document.is_displayed(element) for element in elements]
+        if script == js_scripts.BULK_RECORDS:
+            return [{'text': document.text(element), 'visible': document.is_displayed(element),
+                     'attributes': {name: document.attribute(element, name) for name in args[1]},
+                     'properties': {name: document.attribute(element, name) for name in args[2]}}
+                    for element in elements]
+        if script == js_scripts.FILTER_ELEMENTS:
+            return self._filter(elements, elements, *args[1:])
+        if script == js_scripts.FILTER_BY_INNER_ELEMENTS:
+            return self._filter_by_inner_elements(elements, *args[1:])
+        if script == js_scripts.ELEMENT_PRESENCE:
+            found = document.find(By.XPATH if args[1] else By.CSS_SELECTOR, args[0])
+            return {'present': bool(found), 'visible': bool(found) and document.is_displayed(found[0])}
+        if script == js_scripts.READ_STORAGE:
+            return {'local': dict(self.storage['local']), 'session': dict(self.storage['session'])}
+        if script == js_scripts.WRITE_STORAGE:
+            self.storage = {'local': dict(args[0]), 'session': dict(args[1])}
+            return None
+        if 'scroll' in script:
+            return 0
+        raise WebDriverException("Script is not supported by LxmlDriver")
+
+    def execute_async_script(self, script):
+        """
+        DOM of LxmlDriver never changes, so every "settled" wait is done immediately.
+        """
+        if script == js_scripts.DOCUMENT_READY:
+            return True
+        if script in (js_scripts.NODE_COUNT_SETTLED, js_scripts.MUTATIONS_SETTLED):
+            return {'settled': True, 'count': 0}
+        raise WebDriverException("Async script is not supported by LxmlDriver")
+
+    def _filter(self, elements, targets, attribute, expected, partial, first_only, report_texts):
+        document = self.document
+        matches, values = [], []
+        for element, target in zip(elements, targets):
+            value = document.text(element) if attribute is None else document.attribute(element, attribute)
+            values.append(document.text(element) if report_texts else value)
+            if value is None:
+                continue
+            if attribute is not None:
+                value = value.replace('"', '')
+            if expected in value if partial else expected == value:
+                matches.append(document.reference(target))
+                if first_only:
+                    break
+        return {'matches': matches, 'values': values}
+
+    def _filter_by_inner_elements(self, parents, locator, is_xpath, attribute, expected, partial, first_only,
+                                  return_inner):
+        document = self.document
+        matches, values = [], []
+        for index, parent in enumerate(parents):
+            found = document.find(By.XPATH if is_xpath else By.CSS_SELECTOR, locator, parent)
+            if not found:
+                return {'matches': matches, 'values': values, 'missing': index}
+            inner = found[0]
+            if expected is None:
+                matches.append(document.reference(inner))
+                continue
+            value = document.text(inner) if attribute is None else document.attribute(inner, attribute)
+            if value is not None and attribute is not None:
+                value = value.replace('"', '')
+            values.append(value)
+            if value is not None and (expected in value if partial else expected == value):
+                matches.append(document.reference(inner if return_inner else parent))
+                if first_only:
+                    break
+        return {'matches': matches, 'values': values, 'missing': -1}
+
+
+class LxmlDriver(WebDriver):
+
+    def __init__(self, hidden_classes=HIDDEN_CLASSES):
+        """
+        Browserless driver for page objects and simple scenarios which only need static DOM.
+        Pages are parsed with lxml from files, file:// or http(s):// urls. Nothing is rendered and no JavaScript runs.
+        :param hidden_classes: css classes which make element and its children not displayed
+        """
+        super().__init__(command_executor=LxmlCommandExecutor(hidden_classes),
+                         desired_capabilities={'browserName': 'lxml'})
+
+
+class LxmlBrowser:
+
+    def __init__(self):
+        self.driver = LxmlDriver()
+
+    def close(self):
+        self.driver.close()
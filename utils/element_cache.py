@@ -0,0 +1,54 @@
+import weakref
+
+_caches = weakref.WeakKeyDictionary()
+
+
+class ElementCache(object):
+
+    def __init__(self):
+        """
+        Keeps elements found on currently opened page, keyed by (locator_type, locator, is_visible).
+        Cache has to be cleared whenever the page changes: get_page, refresh_page, back_page or tab switch.
+        """
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def for_driver(driver):
+        """
+        :return: ElementCache object shared by all page objects using the same driver
+        """
+        if driver not in _caches:
+            _caches[driver] = ElementCache()
+        return _caches[driver]
+
+    def get(self, key, find):
+        """
+        :param key: tuple of (locator_type, locator, is_visible)
+        :param find: function called with no arguments to find the element when it is not cached
+        :return: cached or newly found element
+        """
+        if key in self._elements:
+            self.hits += 1
+            return self._elements[key]
+        self.misses += 1
+        element = find()
+        self._elements[key] = element
+        return element
+
+    def invalidate(self):
+        """
+        Forgets all cached elements.
+        """
+        if self._elements:
+            self.invalidations += 1
+        self._elements = {}
+
+    def statistics(self):
+        """
+        :return: dict with number of hits, misses, invalidations and currently cached elements
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations,
+                'cached': len(self._elements)}
@@ -1,12 +1,15 @@
 import random
-import time
 
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as ec
-from selenium.webdriver.support.wait import WebDriverWait
 
+from utils import dom_waits, js_scripts
 from utils.custom_element import CustomElement
+from utils.helpers import Helpers
 from utils.settings.local_settings import EXPLICITLY_WAIT
+from utils.settings.settings import IMPLICITLY_WAIT
+from utils.wait_engine import LocatorCondition, wait_engine
 
 
 class ElementsList(list):
@@ -26,13 +29,14 @@ class ElementsList(list):
         if elements_list:
             elements = elements_list
         elif is_visible is False:
-            elements = WebDriverWait(driver, wait).until(
-                ec.presence_of_all_elements_located((locator_type, locator)))
+            elements = wait_engine.until(driver, ec.presence_of_all_elements_located((locator_type, locator)), wait)
         else:
-            elements = WebDriverWait(driver, wait).until(
-                ec.visibility_of_any_elements_located((locator_type, locator)))
+            elements = wait_engine.until(driver, ec.visibility_of_any_elements_located((locator_type, locator)), wait)
         for element in elements:
-            self.append(CustomElement(driver, element_id=element.id))
+            if isinstance(element, CustomElement):
+                self.append(element)
+            else:
+                self.append(CustomElement(driver, element_id=element.id))
         if not elements_list:
             self.locator_type = locator_type
             self.locator = locator
@@ -69,24 +73,23 @@ class ElementsList(list):
         Additional wait where all elements of given locator are visible.
         :return: ElementsList object
         """
-        elements_list = WebDriverWait(self.driver, wait).until(
-            ec.visibility_of_all_elements_located((self.locator_type, self.locator)))
+        elements_list = wait_engine.until(
+            self.driver, ec.visibility_of_all_elements_located((self.locator_type, self.locator)), wait)
         return ElementsList(self.driver, elements_list=elements_list)
 
     def delayed_wait_for_any_element_visibility(self, delay: int = 1, wait=EXPLICITLY_WAIT):
         """
-        This is additional WebdriverWait mixed with time.sleep() wait.
+        This is additional wait for lists which are rendered in parts.
         Sometimes occurs situation when part of elements of some locator are rendered,
         but this is not a full list of them. So we want to wait for first ones,
-        and then wait some more time for the rest of them.
-        :param delay: number of seconds to wait between two WebdriverWaits
+        and then wait until number of visible elements stops changing.
+        :param delay: maximum number of seconds to wait for the rest of elements
         :return: ElementsList object
         """
-        WebDriverWait(self.driver, wait).until(
-            ec.visibility_of_any_elements_located((self.locator_type, self.locator)))
-        time.sleep(delay)
-        elements_list = WebDriverWait(self.driver, wait).until(
-            ec.visibility_of_any_elements_located((self.locator_type, self.locator)))
+        wait_engine.until(self.driver, ec.visibility_of_any_elements_located((self.locator_type, self.locator)), wait)
+        dom_waits.wait_for_elements_count_settled(self.driver, self.locator, self.locator_type, wait=delay)
+        elements_list = wait_engine.until(
+            self.driver, ec.visibility_of_any_elements_located((self.locator_type, self.locator)), wait)
         return ElementsList(self.driver, elements_list=elements_list)
 
     def get_random_element(self) -> CustomElement:
@@ -108,22 +111,91 @@ class ElementsList(list):
         """
         return [element.text for element in self]
 
+    # -------------------------------------------------------------------------------------------------------
+    # bulk reads - whole list is read with one execute_script call
+    def _execute_bulk_script(self, script, *args):
+        if not self:
+            return []
+        return self.driver.execute_script(script, list(self), *args)
+
+    def get_texts_list_bulk(self):
+        """
+        Same as get_texts_list, but reads texts of all elements in one WebDriver call.
+        Text of element which is not visible is an empty string, like in element.text
+        :return: list of strings when each string is a text of each element from origin list
+        """
+        return self._execute_bulk_script(js_scripts.BULK_TEXTS)
+
+    def get_attributes_list_bulk(self, attribute):
+        """
+        Reads HTML attribute of all elements in one WebDriver call.
+        Unlike element.get_attribute() it doesn't fall back to DOM property of the same name.
+        :param attribute: attribute name like "class", "id", "href", "aria-label"
+        :return: list of attribute values (None when element doesn't have an attribute)
+        """
+        return self._execute_bulk_script(js_scripts.BULK_ATTRIBUTES, attribute)
+
+    def get_properties_list_bulk(self, property_name):
+        """
+        :param property_name: DOM property name like "value", "checked", "href"
+        :return: list of property values of each element from origin list
+        """
+        return self._execute_bulk_script(js_scripts.BULK_PROPERTIES, property_name)
+
+    def get_visibility_list_bulk(self):
+        """
+        :return: list of booleans, True for each visible element from origin list
+        """
+        return self._execute_bulk_script(js_scripts.BULK_VISIBILITY)
+
+    def get_records_bulk(self, attributes=(), properties=()):
+        """
+        Reads everything needed from all elements in one WebDriver call.
+        :param attributes: attribute names to read, i.e. ("class", "href")
+        :param properties: DOM property names to read, i.e. ("value",)
+        :return: list of dicts: {"text": str, "visible": bool, "attributes": dict, "properties": dict}
+        """
+        return self._execute_bulk_script(js_scripts.BULK_RECORDS, list(attributes), list(properties))
+
     def get_length(self):
         """
         :return: length of the list
         """
         return len(self)
 
+    def _members(self, matches):
+        """
+        :param matches: elements returned by an in-browser script
+        :return: elements of the list with the same ids, so they keep their locators and are found again when stale
+        """
+        members = {element.id: element for element in self}
+        return [members.get(match.id, match) for match in matches]
+
+    def _filter_in_browser(self, attribute, expected, partial_value=False, first_only=False, report_texts=False):
+        """
+        Filters elements inside the browser with one WebDriver call.
+        :param attribute: attribute name to compare, None to compare texts of elements
+        :param expected: value to search
+        :param partial_value: if False we search for perfect match, if True we search for given text in a value
+        :param first_only: stop searching on first matching element
+        :param report_texts: if True second returned list contains texts of checked elements
+                                instead of compared values
+        :return: tuple of (list of matching elements, list of values checked before first match or all values)
+        """
+        if not self:
+            return [], []
+        result = self.driver.execute_script(js_scripts.FILTER_ELEMENTS, list(self), attribute, expected,
+                                            partial_value, first_only, report_texts)
+        return result['matches'], result['values']
+
     def get_element_by_text(self, given_text) -> CustomElement:
         """
         :param given_text: text to find in elements
         :return: First element from list that has in its text given value.
         """
-        text_list = []
-        for element in self:
-            text_list.append(element.text)
-            if element.text == given_text:
-                return element
+        matches, text_list = self._filter_in_browser(None, given_text, first_only=True)
+        if matches:
+            return self._members(matches)[0]
         raise Exception(f"Wrong object name. We needed {given_text}, but list contains only values: {text_list}")
 
     def get_elements_by_text(self, given_text):
@@ -131,17 +203,12 @@ class ElementsList(list):
         :param given_text: text to find in elements
         :return: List of elements (ElementsList object) that have in its text given value.
         """
-        elements_list = []
-        text_list = []
-        for element in self:
-            text_list.append(element.text)
-            if element.text == given_text:
-                elements_list.append(element)
         if not self:
             raise Exception("List is empty so we can't take text from anything.")
+        elements_list, text_list = self._filter_in_browser(None, given_text)
         if not elements_list:
             raise Exception(f"Wrong object name. We needed {given_text}, but list contains only values: {text_list}")
-        return ElementsList(self.driver, elements_list=elements_list)
+        return ElementsList(self.driver, elements_list=self._members(elements_list))
 
     def get_element_by_attribute(self, attribute, given_attribute, partial_value=False) -> CustomElement:
         """
@@ -151,19 +218,10 @@ class ElementsList(list):
                                 if True we search for given text in an attribute
         :return: First element from list (CustomElement object) that has desired value in specified attribute
         """
-        text_list = []
-        if partial_value is True:
-            for element in self:
-                text_list.append(element.text)
-                element_attribute = element.get_attribute(attribute).replace('"', '')
-                if given_attribute in element_attribute:
-                    return element
-        else:
-            for element in self:
-                text_list.append(element.text)
-                element_attribute = element.get_attribute(attribute).replace('"', '')
-                if given_attribute == element_attribute:
-                    return element
+        matches, text_list = self._filter_in_browser(attribute, given_attribute, partial_value,
+                                                     first_only=True, report_texts=True)
+        if matches:
+            return self._members(matches)[0]
         raise Exception(f"Wrong object name. We needed {given_attribute}, but list contains only values: {text_list}")
 
     def get_elements_by_attribute(self, attribute, given_attribute, partial_value=False):
@@ -174,19 +232,65 @@ class ElementsList(list):
                                 if True we search for given text in an attribute
         :return: ElementsList object that contains elements with desired value in specified attribute
         """
-        elements_list = []
-        if partial_value is True:
-            for element in self:
-                element_attribute = element.get_attribute(attribute).replace('"', '')
-                if given_attribute in element_attribute:
-                    elements_list.append(element)
-            return ElementsList(self.driver, elements_list=elements_list)
-        else:
-            for element in self:
-                element_attribute = element.get_attribute(attribute).replace('"', '')
-                if given_attribute == element_attribute:
-                    elements_list.append(element)
-            return ElementsList(self.driver, elements_list=elements_list)
+        elements_list, _ = self._filter_in_browser(attribute, given_attribute, partial_value)
+        return ElementsList(self.driver, elements_list=self._members(elements_list))
+
+    def _filter_by_inner_elements(self, inner_locator, locator_type, attribute=None, expected=None,
+                                  partial_value=False, first_only=False, return_inner=False):
+        """
+        Finds inner element of each element from list and filters them inside the browser with one WebDriver call.
+        :param inner_locator: locator of inner element of a parent element
+        :param locator_type: locator type of inner element
+        :param attribute: attribute name of inner element to compare, None to compare texts of inner elements
+        :param expected: value to search, None to take every inner element without filtering
+        :param partial_value: if False we search for perfect match, if True we search for given text in a value
+        :param first_only: stop searching on first matching element
+        :param return_inner: if True inner elements are returned instead of parent elements
+        :return: tuple of (list of matching elements, list of values of inner elements checked)
+        """
+        if not self:
+            return [], []
+        if not Helpers.is_script_locator_supported(locator_type):
+            return self._filter_by_inner_elements_one_by_one(inner_locator, locator_type, attribute, expected,
+                                                             partial_value, first_only, return_inner)
+        locator, is_xpath = Helpers.get_script_locator(inner_locator, locator_type)
+        results = []
+
+        def all_inner_elements_found(driver):
+            results.append(driver.execute_script(js_scripts.FILTER_BY_INNER_ELEMENTS, list(self), locator, is_xpath,
+                                                 attribute, expected, partial_value, first_only, return_inner))
+            return results[-1]['missing'] == -1
+
+        # inner elements rendered asynchronously get the same time as in CustomElement.get_inner_element
+        inner_elements_located = LocatorCondition((locator_type, inner_locator), all_inner_elements_found, single=False)
+        try:
+            wait_engine.until(self.driver, inner_elements_located, IMPLICITLY_WAIT, name='inner_elements_located')
+        except TimeoutException:
+            raise NoSuchElementException(f"Unable to locate inner element {inner_locator} "
+                                         f"of element number {results[-1]['missing'] + 1} from list")
+        return results[-1]['matches'], results[-1]['values']
+
+    def _filter_by_inner_elements_one_by_one(self, inner_locator, locator_type, attribute, expected, partial_value,
+                                             first_only, return_inner):
+        """
+        Same as _filter_by_inner_elements for locator types in-browser scripts can't search by (i.e. link text),
+        inner element of each element is found and read with separate WebDriver calls.
+        """
+        matches, values = [], []
+        for element in self:
+            inner = element.get_inner_element(inner_locator, locator_type)
+            if expected is None:
+                matches.append(inner)
+                continue
+            value = inner.text if attribute is None else inner.get_attribute(attribute)
+            if value is not None and attribute is not None:
+                value = value.replace('"', '')
+            values.append(value)
+            if value is not None and (expected in value if partial_value else value == expected):
+                matches.append(inner if return_inner else element)
+                if first_only:
+                    break
+        return matches, values
 
     def get_element_by_inner_text(self, given_text, inner_locator, locator_type=By.CSS_SELECTOR,
                                   partial_value=False) -> CustomElement:
@@ -198,19 +302,10 @@ class ElementsList(list):
                                 if True we search for given text in an attribute
         :return: First element from list that has in its inner element text with given value.
         """
-        text_list = []
-        if partial_value is True:
-            for element in self:
-                inner_element = element.get_inner_element(inner_locator, locator_type)
-                text_list.append(inner_element.text)
-                if given_text in inner_element.text:
-                    return element
-        else:
-            for element in self:
-                inner_element = element.get_inner_element(inner_locator, locator_type)
-                text_list.append(inner_element.text)
-                if given_text == inner_element.text:
-                    return element
+        matches, text_list = self._filter_by_inner_elements(inner_locator, locator_type, expected=given_text,
+                                                            partial_value=partial_value, first_only=True)
+        if matches:
+            return self._members(matches)[0]
         raise Exception(f"Wrong object name. We needed {given_text}, but list contains only values: {text_list}")
 
     def get_elements_by_inner_text(self, given_text, inner_locator, locator_type=By.CSS_SELECTOR, partial_value=False):
@@ -222,18 +317,9 @@ class ElementsList(list):
                                 if True we search for given text in an attribute
         :return: List of elements (ElementsList object) that have in its inner element text with given value.
         """
-        elements_list = []
-        if partial_value is True:
-            for element in self:
-                inner_element = element.get_inner_element(inner_locator, locator_type)
-                if given_text in inner_element.text:
-                    elements_list.append(element)
-        else:
-            for element in self:
-                inner_element = element.get_inner_element(inner_locator, locator_type)
-                if given_text == inner_element.text:
-                    elements_list.append(element)
-        return ElementsList(self.driver, elements_list=elements_list)
+        elements_list, _ = self._filter_by_inner_elements(inner_locator, locator_type, expected=given_text,
+                                                          partial_value=partial_value)
+        return ElementsList(self.driver, elements_list=self._members(elements_list))
 
     def get_element_by_inner_attribute(self, attribute, given_attribute, inner_locator,
                                        locator_type=By.CSS_SELECTOR, partial_value=False) -> CustomElement:
@@ -247,21 +333,10 @@ class ElementsList(list):
         :return: First element from list (CustomElement object),
                 that haa inner element with desired value in specified attribute
         """
-        text_list = []
-        if partial_value is True:
-            for element in self:
-                inner_element = element.get_inner_element(inner_locator, locator_type)
-                inner_element_attribute = inner_element.get_attribute(attribute).replace('"', '')
-                text_list.append(inner_element_attribute)
-                if given_attribute in inner_element_attribute:
-                    return element
-        else:
-            for element in self:
-                inner_element = element.get_inner_element(inner_locator, locator_type)
-                inner_element_attribute = inner_element.get_attribute(attribute).replace('"', '')
-                text_list.append(inner_element_attribute)
-                if given_attribute == inner_element_attribute:
-                    return element
+        matches, text_list = self._filter_by_inner_elements(inner_locator, locator_type, attribute, given_attribute,
+                                                            partial_value, first_only=True)
+        if matches:
+            return self._members(matches)[0]
         raise Exception(f"Wrong object name. We needed {given_attribute}, but list contains only values: {text_list}")
 
     def get_elements_by_inner_attribute(self, attribute, given_attribute, inner_locator, locator_type=By.CSS_SELECTOR,
@@ -276,20 +351,9 @@ class ElementsList(list):
         :return: List of elements (CustomElement object),
                 that have inner element with desired value in specified attribute
         """
-        elements_list = []
-        if partial_value is True:
-            for element in self:
-                inner_element = element.get_inner_element(inner_locator, locator_type)
-                inner_element_attribute = inner_element.get_attribute(attribute).replace('"', '')
-                if given_attribute in inner_element_attribute:
-                    elements_list.append(element)
-        else:
-            for element in self:
-                inner_element = element.get_inner_element(inner_locator, locator_type)
-                inner_element_attribute = inner_element.get_attribute(attribute).replace('"', '')
-                if given_attribute == inner_element_attribute:
-                    elements_list.append(element)
-        return ElementsList(self.driver, elements_list=elements_list)
+        elements_list, _ = self._filter_by_inner_elements(inner_locator, locator_type, attribute, given_attribute,
+                                                          partial_value)
+        return ElementsList(self.driver, elements_list=self._members(elements_list))
 
     def get_inner_elements_list(self, inner_locator, locator_type=By.CSS_SELECTOR):
         """
@@ -297,8 +361,5 @@ class ElementsList(list):
         :param locator_type: locator of inner element of a parent element
         :return: list of inner elements for each element from parent list
         """
-        elements_list = []
-        for element in self:
-            inner_element = element.get_inner_element(inner_locator, locator_type)
-            elements_list.append(inner_element)
+        elements_list, _ = self._filter_by_inner_elements(inner_locator, locator_type, return_inner=True)
         return ElementsList(self.driver, elements_list=elements_list)
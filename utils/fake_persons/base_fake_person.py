@@ -1,22 +1,70 @@
+import itertools
+import os
 import random
+import threading
 import time
+from typing import TYPE_CHECKING
 
 from trans import trans
-from faker import Faker
+
+if TYPE_CHECKING:
+    # only for annotations, at runtime Faker is imported on first use
+    from faker import Faker
+
+# unique per process and run, so emails don't collide between runs and parallel workers
+RUN_TOKEN = f"{int(time.time() * 1000) % 36 ** 6:x}{os.getpid() % 4096:x}"
 
 
 class FakePerson(object):
+    _fakers = {}
+    _random = random.Random()
+    _email_counter = itertools.count(1)
+    _lock = threading.Lock()
+    _seed = None
 
     def __init__(self):
-        self.fake = Faker
+        self.fake = self.get_faker
 
-    @staticmethod
-    def _generate_sex():
-        sex = random.choice(['male', 'female'])
+    @classmethod
+    def get_faker(cls, faker_provider: str):
+        """
+        Initialization of Faker locale is expensive, so one Faker is created per locale and reused.
+        Faker itself is imported on first use, it takes a large part of startup time.
+        """
+        with cls._lock:
+            if faker_provider not in cls._fakers:
+                from faker import Faker
+                cls._fakers[faker_provider] = Faker(faker_provider)
+                if cls._seed is not None:
+                    cls._fakers[faker_provider].seed_instance(cls._seed)
+            return cls._fakers[faker_provider]
+
+    @classmethod
+    def get_random(cls):
+        """
+        :return: random.Random used to generate persons, other random choices made with it (i.e. avatars)
+                follow the same seed
+        """
+        return cls._random
+
+    @classmethod
+    def seed(cls, seed):
+        """
+        Makes generated persons deterministic, i.e. seeded with the scenario name before each scenario.
+        Emails stay unique, they don't depend on the seed.
+        """
+        cls._random.seed(seed)
+        for faker in cls._fakers.values():
+            faker.seed_instance(seed)
+        cls._seed = seed
+
+    @classmethod
+    def _generate_sex(cls):
+        sex = cls._random.choice(['male', 'female'])
         return sex
 
     @staticmethod
-    def _generate_full_name(faker: Faker, sex, last_name_param=None):
+    def _generate_full_name(faker: 'Faker', sex, last_name_param=None):
         fake = faker
         if sex == 'male':
             first_name = fake.first_name_male()
@@ -28,20 +76,21 @@ class FakePerson(object):
             last_name = fake.last_name()
         return str(first_name), str(last_name)
 
-    @staticmethod
-    def _generate_email(first_name: str, last_name: str, role: str):
-        random_number = str(round(time.time() * 1000))
-        email = f"{trans(first_name.lower())}.{trans(last_name.lower())}.{role.lower()}.test{random_number[8:12]}@niepodam.pl"
+    @classmethod
+    def _generate_email(cls, first_name: str, last_name: str, role: str):
+        with cls._lock:
+            number = next(cls._email_counter)
+        email = f"{trans(first_name.lower())}.{trans(last_name.lower())}.{role.lower()}.test{RUN_TOKEN}.{number}@niepodam.pl"
         return email
 
     @staticmethod
-    def _generate_phone_number(faker: Faker):
+    def _generate_phone_number(faker: 'Faker'):
         fake = faker
         phone_num = fake.phone_number()
         return phone_num
 
     @staticmethod
-    def pick_birthday(faker: Faker, min_age: int, max_age: int):
+    def pick_birthday(faker: 'Faker', min_age: int, max_age: int):
         fake = faker
         date_time = str(
             fake.date_of_birth(tzinfo=None, minimum_age=min_age, maximum_age=max_age))
@@ -49,7 +98,7 @@ class FakePerson(object):
         return str(date)
 
     def generate_basic_information(self, faker_provider: str, role: str):
-        faker = self.fake(faker_provider)
+        faker = self.get_faker(faker_provider)
         sex = self._generate_sex()
         first_name, last_name = self._generate_full_name(sex=sex, faker=faker)
         full_name = first_name + ' ' + last_name
@@ -57,3 +106,9 @@ class FakePerson(object):
         phone_number = self._generate_phone_number(faker=faker)
         birthday = self.pick_birthday(faker, min_age=18, max_age=80)
         return sex, first_name, last_name, full_name, email, phone_number, birthday
+
+    def generate_batch(self, faker_provider: str, role: str, count: int):
+        """
+        :return: list of count tuples in the same format as generate_basic_information
+        """
+        return [self.generate_basic_information(faker_provider, role) for _ in range(count)]
@@ -1,15 +1,35 @@
 from utils.fake_persons.base_fake_person import FakePerson
+from utils.fake_persons.person_pool import person_pool
+from utils.settings.settings import USE_PERSON_POOL
+
+PROVIDER = 'pl_PL'
 
 
 class FakeClient(FakePerson):
 
-    def __init__(self):
+    def __init__(self, basic_information=None):
+        """
+        :param basic_information: tuple from generate_basic_information, when not given it is claimed
+                                  from the person pool (USE_PERSON_POOL) or generated
+        """
         super().__init__()
-        self.provider = 'pl_PL'
+        self.provider = PROVIDER
         self.sex, \
         self.first_name, \
         self.last_name, \
         self.full_name, \
         self.email, \
         self.phone_number,\
-        self.birthday = self.generate_basic_information(self.provider, 'client')
+        self.birthday = basic_information or self._pooled_information() or \
+            self.generate_basic_information(self.provider, 'client')
+
+    def _pooled_information(self):
+        pool = person_pool(self.provider, 'client') if USE_PERSON_POOL else None
+        return pool.claim() if pool else None
+
+    @classmethod
+    def batch(cls, count):
+        """
+        :return: list of count FakeClient objects
+        """
+        return [cls(basic_information) for basic_information in FakePerson().generate_batch(PROVIDER, 'client', count)]
@@ -0,0 +1,137 @@
+"""
+Pool of pre-generated persons in a memory-mapped file, shared by all worker processes.
+
+    python -m utils.fake_persons.person_pool --count 100000                 # generates pl_PL clients
+    python -m utils.fake_persons.person_pool --count 1000 --role admin
+    python -m utils.fake_persons.person_pool --reset-claims                 # makes every person available again
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import threading
+
+from utils.fake_persons.base_fake_person import FakePerson
+from utils.settings.settings import PATH_TO_PROJECT, PERSON_POOLS_DIR
+
+MAGIC = b'PERSONS1'
+HEADER = struct.Struct('<8sI')
+# sex, first name, last name, email, phone number, birthday as null padded utf-8
+FIELD_SIZES = (6, 48, 64, 128, 32, 10)
+RECORD = struct.Struct('<' + ''.join(f"{size}s" for size in FIELD_SIZES))
+CLAIM_SIZE = 8
+
+
+class PersonPool(object):
+
+    def __init__(self, path):
+        """
+        Records are read straight from the memory-mapped file.
+        Each record is handed out once, also between runs, until claims are reset or the pool is generated again.
+        Claiming is a small O_APPEND write to <path>.claims, which the OS makes atomic between processes,
+        and its position is the number of the claimed record, so no lock between processes is needed.
+        Threads of a process share the file offset, so they claim one at a time.
+        :param path: path to a file created by PersonPool.generate
+        """
+        self.path = path
+        self.claims_path = f"{path}.claims"
+        with open(path, 'rb') as pool_file:
+            self.data = mmap.mmap(pool_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            raise Exception(f"{path} is not a person pool file")
+        self.claims_file = os.open(self.claims_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+        self.claims_lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def record(self, index):
+        """
+        :return: tuple in the same format as FakePerson.generate_basic_information
+        """
+        offset = HEADER.size + index * RECORD.size
+        fields = [field.rstrip(b'\0').decode() for field in RECORD.unpack_from(self.data, offset)]
+        sex, first_name, last_name, email, phone_number, birthday = fields
+        return sex, first_name, last_name, f"{first_name} {last_name}", email, phone_number, birthday
+
+    def claim(self):
+        """
+        :return: next unused record
+        """
+        with self.claims_lock:
+            os.write(self.claims_file, os.getpid().to_bytes(CLAIM_SIZE, 'little'))
+            index = os.lseek(self.claims_file, 0, os.SEEK_CUR) // CLAIM_SIZE - 1
+        if index >= self.count:
+            raise Exception(f"Person pool {self.path} is exhausted, generate a new one or reset claims")
+        return self.record(index)
+
+    def remaining(self):
+        return max(0, self.count - os.path.getsize(self.claims_path) // CLAIM_SIZE)
+
+    def close(self):
+        os.close(self.claims_file)
+        self.data.close()
+
+    @staticmethod
+    def path_for(faker_provider, role, directory=PERSON_POOLS_DIR):
+        directory = directory or os.path.join(PATH_TO_PROJECT, '.person_pools')
+        return os.path.join(directory, f"{faker_provider}_{role}.pool")
+
+    @staticmethod
+    def generate(path, count, faker_provider, role):
+        """
+        Writes count persons generated by FakePerson to path and removes claims of the previous pool.
+        Persons with fields longer than the record allows are generated again.
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        person = FakePerson()
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'wb') as pool_file:
+            pool_file.write(HEADER.pack(MAGIC, count))
+            written = 0
+            while written < count:
+                sex, first_name, last_name, _, email, phone_number, birthday = \
+                    person.generate_basic_information(faker_provider, role)
+                fields = [field.encode() for field in (sex, first_name, last_name, email, phone_number, birthday)]
+                if any(len(field) > size for field, size in zip(fields, FIELD_SIZES)):
+                    continue
+                pool_file.write(RECORD.pack(*fields))
+                written += 1
+        os.replace(temporary_path, path)
+        PersonPool.reset_claims(path)
+
+    @staticmethod
+    def reset_claims(path):
+        if os.path.exists(f"{path}.claims"):
+            os.remove(f"{path}.claims")
+
+
+_pools = {}
+
+
+def person_pool(faker_provider, role):
+    """
+    :return: PersonPool of the provider and role opened once per process, None when it wasn't generated
+    """
+    path = PersonPool.path_for(faker_provider, role)
+    if path not in _pools:
+        _pools[path] = PersonPool(path) if os.path.exists(path) else None
+    return _pools[path]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generates pool of fake persons shared by worker processes.')
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--provider', default='pl_PL')
+    parser.add_argument('--role', default='client')
+    parser.add_argument('--reset-claims', action='store_true', help="don't generate, make all persons available")
+    arguments = parser.parse_args()
+    pool_path = PersonPool.path_for(arguments.provider, arguments.role)
+    if arguments.reset_claims:
+        PersonPool.reset_claims(pool_path)
+    else:
+        PersonPool.generate(pool_path, arguments.count, arguments.provider, arguments.role)
+    print(f"{pool_path}: {PersonPool(pool_path).remaining()} persons available")
+    sys.exit(0)
@@ -1,6 +1,7 @@
 import re
 
 from parse import parse
+from selenium.webdriver.common.by import By
 
 
 class Helpers(object):
@@ -15,3 +16,27 @@ class Helpers(object):
 
     def parse_text(self, text, parsing_format, which_fragment):
         return parse(parsing_format, text).fixed[which_fragment - 1]
+
+    # locator types which in-browser scripts can search by, converted to css selectors
+    SCRIPT_LOCATORS = {
+        By.CSS_SELECTOR: lambda value: value,
+        By.ID: lambda value: f'[id="{value}"]',
+        By.NAME: lambda value: f'[name="{value}"]',
+        By.CLASS_NAME: lambda value: f".{value}",
+        By.TAG_NAME: lambda value: value,
+    }
+
+    @staticmethod
+    def is_script_locator_supported(locator_type):
+        return locator_type == By.XPATH or locator_type in Helpers.SCRIPT_LOCATORS
+
+    @staticmethod
+    def get_script_locator(locator, locator_type):
+        """
+        :return: tuple of (css selector or xpath, True if it is an xpath) understood by in-browser scripts
+        """
+        if locator_type == By.XPATH:
+            return locator, True
+        if locator_type not in Helpers.SCRIPT_LOCATORS:
+            raise Exception(f"Locator type {locator_type} is not supported in in-browser scripts.")
+        return Helpers.SCRIPT_LOCATORS[locator_type](locator), False
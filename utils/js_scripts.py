@@ -0,0 +1,261 @@
+# Scripts executed in the browser with driver.execute_script().
+# Each of them works on the whole list of elements passed as arguments[0], so reading the list
+# costs one WebDriver round trip instead of one round trip per element.
+
+VISIBILITY_HELPERS = r"""
+function isVisible(element) {
+    var style = window.getComputedStyle(element);
+    return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0'
+        && !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+}
+// normalized like element.text of WebDriver: no-break spaces, runs of whitespaces and spaces around line breaks
+function textOf(element) {
+    if (!isVisible(element)) {
+        return '';
+    }
+    return element.innerText.replace(/\u00a0/g, ' ').replace(/[ \f\t\v\u2028\u2029]+/g, ' ')
+        .replace(/ ?\n ?/g, '\n').replace(/\n+/g, '\n').trim();
+}
+"""
+
+BULK_TEXTS = VISIBILITY_HELPERS + """
+return arguments[0].map(textOf);
+"""
+
+BULK_ATTRIBUTES = """
+var name = arguments[1];
+return arguments[0].map(function (element) { return element.getAttribute(name); });
+"""
+
+BULK_PROPERTIES = """
+var name = arguments[1];
+return arguments[0].map(function (element) { return element[name]; });
+"""
+
+BULK_VISIBILITY = VISIBILITY_HELPERS + """
+return arguments[0].map(isVisible);
+"""
+
+BULK_RECORDS = VISIBILITY_HELPERS + """
+var attributes = arguments[1], properties = arguments[2];
+return arguments[0].map(function (element) {
+    var record = {text: textOf(element), visible: isVisible(element), attributes: {}, properties: {}};
+    attributes.forEach(function (name) { record.attributes[name] = element.getAttribute(name); });
+    properties.forEach(function (name) { record.properties[name] = element[name]; });
+    return record;
+});
+"""
+
+# Mirrors what WebElement.get_attribute() returns: DOM property when it is a primitive, HTML attribute otherwise.
+ATTRIBUTE_HELPERS = """
+var BOOLEAN_ATTRIBUTES = ['checked', 'disabled', 'hidden', 'multiple', 'readonly', 'required', 'selected'];
+var PROPERTY_ALIASES = {'class': 'className', 'readonly': 'readOnly'};
+function attributeOf(element, name) {
+    var lowerName = name.toLowerCase();
+    if (lowerName === 'style') {
+        return element.style.cssText;
+    }
+    if (BOOLEAN_ATTRIBUTES.indexOf(lowerName) !== -1) {
+        return element.hasAttribute(name) || element[PROPERTY_ALIASES[lowerName] || lowerName] ? 'true' : null;
+    }
+    if ((element.tagName === 'A' && lowerName === 'href') || (element.tagName === 'IMG' && lowerName === 'src')) {
+        return element.getAttribute(name) ? element[lowerName] : element.getAttribute(name);
+    }
+    var property = element[PROPERTY_ALIASES[name] || name];
+    var value = (property === null || property === undefined || typeof property === 'object'
+                 || typeof property === 'function') ? element.getAttribute(name) : property;
+    return value === null || value === undefined ? null : String(value);
+}
+"""
+
+# arguments: elements, attribute name (null to filter by text), expected value, partial match,
+# stop on first match, report texts instead of filtered values in "values"
+FILTER_ELEMENTS = VISIBILITY_HELPERS + ATTRIBUTE_HELPERS + """
+var elements = arguments[0], attribute = arguments[1], expected = arguments[2],
+    partial = arguments[3], firstOnly = arguments[4], reportTexts = arguments[5];
+var matches = [], values = [];
+for (var i = 0; i < elements.length; i++) {
+    var value = attribute === null ? textOf(elements[i]) : attributeOf(elements[i], attribute);
+    values.push(reportTexts ? textOf(elements[i]) : value);
+    if (value === null) {
+        continue;
+    }
+    if (attribute !== null) {
+        value = value.replace(/"/g, '');
+    }
+    if (partial ? value.indexOf(expected) !== -1 : value === expected) {
+        matches.push(elements[i]);
+        if (firstOnly) {
+            break;
+        }
+    }
+}
+return {matches: matches, values: values};
+"""
+
+# arguments: parent elements, inner locator, is locator an xpath, attribute name (null to filter by text),
+# expected value (null to take every inner element), partial match, stop on first match,
+# return inner elements instead of parents
+FILTER_BY_INNER_ELEMENTS = VISIBILITY_HELPERS + ATTRIBUTE_HELPERS + """
+var parents = arguments[0], locator = arguments[1], isXpath = arguments[2], attribute = arguments[3],
+    expected = arguments[4], partial = arguments[5], firstOnly = arguments[6], returnInner = arguments[7];
+function innerOf(parent) {
+    if (isXpath) {
+        return document.evaluate(locator, parent, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return parent.querySelector(locator);
+}
+var matches = [], values = [], missing = -1;
+for (var i = 0; i < parents.length; i++) {
+    var inner = innerOf(parents[i]);
+    if (inner === null) {
+        missing = i;
+        break;
+    }
+    if (expected === null) {
+        matches.push(inner);
+        continue;
+    }
+    var value = attribute === null ? textOf(inner) : attributeOf(inner, attribute);
+    if (value === null) {
+        values.push(value);
+        continue;
+    }
+    if (attribute !== null) {
+        value = value.replace(/"/g, '');
+    }
+    values.push(value);
+    if (partial ? value.indexOf(expected) !== -1 : value === expected) {
+        matches.push(returnInner ? inner : parents[i]);
+        if (firstOnly) {
+            break;
+        }
+    }
+}
+return {matches: matches, values: values, missing: missing};
+"""
+
+# arguments: locator, is locator an xpath
+ELEMENT_PRESENCE = VISIBILITY_HELPERS + """
+var locator = arguments[0], isXpath = arguments[1];
+var element = isXpath
+    ? document.evaluate(locator, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(locator);
+return {present: element !== null, visible: element !== null && isVisible(element)};
+"""
+
+# Asynchronous scripts, executed with driver.execute_async_script(). The last argument is the callback.
+
+# arguments: locator, is locator an xpath, count only visible elements, quiet period in ms, timeout in ms
+NODE_COUNT_SETTLED = VISIBILITY_HELPERS + """
+var locator = arguments[0], isXpath = arguments[1], visibleOnly = arguments[2],
+    quietPeriod = arguments[3], timeout = arguments[4], done = arguments[arguments.length - 1];
+function nodes() {
+    if (!isXpath) {
+        return Array.prototype.slice.call(document.querySelectorAll(locator));
+    }
+    var snapshot = document.evaluate(locator, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var result = [];
+    for (var i = 0; i < snapshot.snapshotLength; i++) {
+        result.push(snapshot.snapshotItem(i));
+    }
+    return result;
+}
+function count() {
+    var found = nodes();
+    return visibleOnly ? found.filter(isVisible).length : found.length;
+}
+var last = count(), finished = false, quietTimer = null;
+var observer = new MutationObserver(function () {
+    var current = count();
+    if (current !== last) {
+        last = current;
+        restart();
+    }
+});
+function finish(settled) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(timeoutTimer);
+    done({settled: settled, count: last});
+}
+function restart() {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(function () { finish(true); }, quietPeriod);
+}
+var timeoutTimer = setTimeout(function () { finish(false); }, timeout);
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+restart();
+"""
+
+# arguments: observed element (null for whole document), quiet period in ms, timeout in ms
+MUTATIONS_SETTLED = """
+var target = arguments[0] || document.documentElement, quietPeriod = arguments[1],
+    timeout = arguments[2], done = arguments[arguments.length - 1];
+var finished = false, quietTimer = null;
+var observer = new MutationObserver(restart);
+function finish(settled) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(timeoutTimer);
+    done({settled: settled});
+}
+function restart() {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(function () { finish(true); }, quietPeriod);
+}
+var timeoutTimer = setTimeout(function () { finish(false); }, timeout);
+observer.observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+restart();
+"""
+
+# arguments: expected document.readyState ("interactive" or "complete"), timeout in ms
+DOCUMENT_READY = """
+var expected = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+var states = ['loading', 'interactive', 'complete'];
+function isReady() {
+    return states.indexOf(document.readyState) >= states.indexOf(expected);
+}
+if (isReady()) {
+    done(true);
+} else {
+    var timeoutTimer = setTimeout(function () { done(false); }, timeout);
+    document.addEventListener('readystatechange', function listener() {
+        if (isReady()) {
+            clearTimeout(timeoutTimer);
+            document.removeEventListener('readystatechange', listener);
+            done(true);
+        }
+    });
+}
+"""
+
+# no arguments, returns {local: {key: value}, session: {key: value}} of the current origin
+READ_STORAGE = """
+function read(storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        items[storage.key(i)] = storage.getItem(storage.key(i));
+    }
+    return items;
+}
+return {local: read(window.localStorage), session: read(window.sessionStorage)};
+"""
+
+# arguments: {key: value} for localStorage, {key: value} for sessionStorage
+WRITE_STORAGE = """
+function write(storage, items) {
+    storage.clear();
+    Object.keys(items).forEach(function (key) { storage.setItem(key, items[key]); });
+}
+write(window.localStorage, arguments[0]);
+write(window.sessionStorage, arguments[1]);
+"""
@@ -0,0 +1,282 @@
+"""
+Locator compiler: converts XPath locators of page objects to equivalent CSS selectors where possible
+and reports absolute, duplicated and malformed locators.
+
+    python -m utils.locator_compiler           # report of all page objects in pages/
+    python -m utils.locator_compiler --strict  # exits with 1 when any locator has issues
+"""
+import argparse
+import functools
+import importlib
+import inspect
+import pkgutil
+import re
+import sys
+
+from selenium.webdriver.common.by import By
+
+PAGES_PACKAGE = 'pages'
+# more child steps than this in one locator is a copy of the page structure, it breaks with every layout change
+MAX_CHILD_STEPS = 5
+ABSOLUTE_PREFIXES = ('/html', '//html', '/body', '//body')
+
+# value is everything up to the closing quote of the same kind, so "@a='x' and @b='y'" doesn't match as one value
+ATTRIBUTE_EQUALS = re.compile(r"""@([\w-]+)\s*=\s*(['"])((?:(?!\2).)*)\2""", re.S)
+ATTRIBUTE_CONTAINS = re.compile(r"""contains\(\s*@([\w-]+)\s*,\s*(['"])((?:(?!\2).)*)\2\s*\)""", re.S)
+ATTRIBUTE_STARTS_WITH = re.compile(r"""starts-with\(\s*@([\w-]+)\s*,\s*(['"])((?:(?!\2).)*)\2\s*\)""", re.S)
+QUOTED = re.compile(r"""'[^']*'|"[^"]*\"""")
+BOOLEAN_OPERATOR = re.compile(r"\b(and|or)\b")
+ATTRIBUTE_EXISTS = re.compile(r"@([\w-]+)")
+POSITION = re.compile(r"\d+")
+NODE_NAME = re.compile(r"[a-zA-Z][\w-]*|\*")
+CSS_IDENTIFIER = re.compile(r"[a-zA-Z_][\w-]*")
+
+
+class LocatorIssue(object):
+
+    def __init__(self, page, attribute, locator, kind, details):
+        """
+        :param kind: "absolute", "duplicated" or "malformed"
+        """
+        self.page = page
+        self.attribute = attribute
+        self.locator = locator
+        self.kind = kind
+        self.details = details
+
+    def __str__(self):
+        return f"{self.kind.upper()} {self.page}.{self.attribute}: {self.details}"
+
+
+# -------------------------------------------------------------------------------------------------------
+# compiling
+def split_steps(xpath):
+    """
+    :return: list of (axis, step) where axis is "//" or "/", None when the xpath has unbalanced quotes or brackets
+    """
+    steps, step, axis, depth, quote = [], '', None, 0, None
+    index = 0
+    while index < len(xpath):
+        char = xpath[index]
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '\'"':
+            quote = char
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+            if depth < 0:
+                return None
+        elif char == '/' and depth == 0:
+            if axis is not None:
+                steps.append((axis, step))
+            axis = '//' if xpath[index:index + 2] == '//' else '/'
+            index += len(axis)
+            step = ''
+            continue
+        step += char
+        index += 1
+    if quote or depth:
+        return None
+    if axis is not None:
+        steps.append((axis, step))
+    return steps
+
+
+def split_predicates(step):
+    """
+    :return: tuple of (node name, list of predicates without brackets)
+    """
+    name_end = step.find('[')
+    if name_end == -1:
+        return step, []
+    predicates, depth, quote, start = [], 0, None, name_end
+    for index in range(name_end, len(step)):
+        char = step[index]
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '\'"':
+            quote = char
+        elif char == '[':
+            depth += 1
+            if depth == 1:
+                start = index + 1
+        elif char == ']':
+            depth -= 1
+            if depth == 0:
+                predicates.append(step[start:index].strip())
+    return step[:name_end], predicates
+
+
+def css_string(value):
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def predicate_to_css(name, predicate, first=True):
+    """
+    :param first: the predicate is the first one of its step, only then a position means the same as :nth-of-type
+    :return: css equivalent of an xpath predicate or None when there is no equivalent
+    """
+    if BOOLEAN_OPERATOR.search(QUOTED.sub('', predicate)):
+        return None
+    match = ATTRIBUTE_EQUALS.fullmatch(predicate)
+    if match:
+        attribute, _, value = match.groups()
+        if attribute == 'id' and CSS_IDENTIFIER.fullmatch(value):
+            return f"#{value}"
+        return f"[{attribute}={css_string(value)}]"
+    for pattern, operator in ((ATTRIBUTE_CONTAINS, '*='), (ATTRIBUTE_STARTS_WITH, '^=')):
+        match = pattern.fullmatch(predicate)
+        if match:
+            attribute, _, value = match.groups()
+            return f"[{attribute}{operator}{css_string(value)}]"
+    if ATTRIBUTE_EXISTS.fullmatch(predicate):
+        return f"[{predicate[1:]}]"
+    if POSITION.fullmatch(predicate) and name != '*' and first:
+        # li[3] is the third li among its siblings, like li:nth-of-type(3),
+        # but li[@class='x'][3] is the third of the li elements with class x, which css can't express
+        return f":nth-of-type({predicate})"
+    return None
+
+
+def xpath_to_css(xpath):
+    """
+    Converts xpath built of //tag and /tag steps with attribute and position predicates to equivalent css selector.
+    :return: css selector or None when there is no equivalent, i.e. for text() or axes
+    """
+    if not xpath.startswith('//'):
+        return None
+    steps = split_steps(xpath)
+    if not steps:
+        return None
+    selectors = []
+    for axis, step in steps:
+        name, predicates = split_predicates(step.strip())
+        if not NODE_NAME.fullmatch(name):
+            return None
+        parts = [predicate_to_css(name, predicate, index == 0) for index, predicate in enumerate(predicates)]
+        if None in parts:
+            return None
+        selector = ('' if name == '*' and parts else name) + ''.join(parts)
+        if selectors:
+            selectors.append(' ' if axis == '//' else ' > ')
+        selectors.append(selector)
+    return ''.join(selectors)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_locator(locator, locator_type=By.XPATH):
+    """
+    Browsers resolve css selectors natively and faster than xpath, so xpath is replaced with css when it is equivalent.
+    :return: tuple of (locator type, locator) which should be used
+    """
+    if locator_type == By.XPATH and locator:
+        css = xpath_to_css(locator)
+        if css:
+            return By.CSS_SELECTOR, css
+    return locator_type, locator
+
+
+# -------------------------------------------------------------------------------------------------------
+# checks
+def check_locator(page, attribute, locator):
+    """
+    :return: list of LocatorIssue objects: absolute or malformed locator
+    """
+    issues = []
+    if locator.startswith('/') and not locator.startswith('//') and not locator.startswith('/html'):
+        issues.append(LocatorIssue(page, attribute, locator, 'malformed',
+                                   f"starts with a single '/', it searches from the document root: {locator}"))
+    elif split_steps(locator) is None or not is_valid_xpath(locator):
+        issues.append(LocatorIssue(page, attribute, locator, 'malformed', f"is not a valid xpath: {locator}"))
+    else:
+        child_steps = sum(1 for axis, _ in split_steps(locator) if axis == '/')
+        if locator.startswith(ABSOLUTE_PREFIXES) or child_steps > MAX_CHILD_STEPS:
+            issues.append(LocatorIssue(page, attribute, locator, 'absolute',
+                                       f"follows the page structure from the {locator.split('/')[2] or 'root'}"
+                                       f" element with {child_steps} child steps"))
+    return issues
+
+
+def is_valid_xpath(locator):
+    try:
+        # lxml is optional, without it only brackets and quotes are checked
+        from lxml import etree
+    except ImportError:
+        return True
+    try:
+        etree.XPath(locator)
+    except etree.XPathSyntaxError:
+        return False
+    return True
+
+
+def page_locators(page_class):
+    """
+    :return: dict of locator attributes defined in the page object class
+    """
+    return {name: value for name, value in vars(page_class).items()
+            if not name.startswith('_') and isinstance(value, str) and is_xpath(value)}
+
+
+def is_xpath(value):
+    """
+    "./" and ".." start relative xpaths, while ".logo" is a css class selector
+    """
+    value = value.strip()
+    return value.startswith(('/', '(', './', '..'))
+
+
+def discover_pages(package=PAGES_PACKAGE):
+    """
+    :return: list of page object classes defined in modules of the package
+    """
+    from utils.base_page import BasePage
+    pages = []
+    for module_info in pkgutil.iter_modules(importlib.import_module(package).__path__):
+        module = importlib.import_module(f"{package}.{module_info.name}")
+        pages.extend(member for _, member in inspect.getmembers(module, inspect.isclass)
+                     if issubclass(member, BasePage) and member.__module__ == module.__name__)
+    return pages
+
+
+def analyze_page(page_class):
+    """
+    :return: tuple of (list of (attribute, locator type, locator) after compiling, list of LocatorIssue objects)
+    """
+    page = page_class.__name__
+    compiled, issues, seen = [], [], {}
+    for attribute, locator in page_locators(page_class).items():
+        compiled.append((attribute, *compile_locator(locator)))
+        issues.extend(check_locator(page, attribute, locator))
+        if locator in seen:
+            issues.append(LocatorIssue(page, attribute, locator, 'duplicated', f"same locator as {seen[locator]}"))
+        else:
+            seen[locator] = attribute
+    return compiled, issues
+
+
+def report(pages):
+    """
+    :return: tuple of (report string, number of issues)
+    """
+    lines, issues_count = [], 0
+    for page_class in pages:
+        compiled, issues = analyze_page(page_class)
+        converted = sum(1 for _, locator_type, _ in compiled if locator_type == By.CSS_SELECTOR)
+        lines.append(f"{page_class.__name__}: {len(compiled)} locators, {converted} compiled to css")
+        lines.extend(f"  {attribute:30} {locator_type:12} {locator}" for attribute, locator_type, locator in compiled)
+        lines.extend(f"  {issue}" for issue in issues)
+        issues_count += len(issues)
+    return "\n".join(lines), issues_count
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compiles page object locators and reports brittle ones.')
+    parser.add_argument('--package', default=PAGES_PACKAGE)
+    parser.add_argument('--strict', action='store_true', help='exit with 1 when any locator has issues')
+    arguments = parser.parse_args()
+    text, found_issues = report(discover_pages(arguments.package))
+    print(text)
+    sys.exit(1 if arguments.strict and found_issues else 0)
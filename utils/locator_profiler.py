@@ -0,0 +1,144 @@
+import json
+import os
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.locator_compiler import compile_locator, page_locators
+from utils.page_registry import page_registry
+from utils.wait_engine import wait_engine
+
+NOT_IN_PAGE_OBJECTS = '(not in page objects)'
+
+
+class LocatorStatistics(object):
+
+    def __init__(self, owner, locator_type, locator):
+        """
+        :param owner: page-object attribute the locator is defined in, i.e. "MainHeader.main_banner"
+        """
+        self.owner = owner
+        self.locator_type = locator_type
+        self.locator = locator
+        self.lookups = 0
+        self.timeouts = 0
+        self.polls = 0
+        self.matched = 0
+        self.max_matched = 0
+        self.ambiguous = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    @property
+    def page(self):
+        return self.owner.split('.')[0]
+
+    def add(self, wait_time, polls, matched, timed_out, single):
+        """
+        :param matched: number of nodes the locator matched after the wait
+        :param timed_out: the wait didn't find the element
+        :param single: lookup of one element (CustomElement), which is ambiguous when more nodes match the locator
+        """
+        self.lookups += 1
+        self.polls += polls
+        self.total_time += wait_time
+        self.max_time = max(self.max_time, wait_time)
+        self.matched += matched
+        self.max_matched = max(self.max_matched, matched)
+        self.timeouts += timed_out
+        self.ambiguous += single and matched > 1
+
+    def as_dict(self):
+        return {'owner': self.owner, 'locator_type': self.locator_type, 'locator': self.locator,
+                'lookups': self.lookups, 'timeouts': self.timeouts, 'polls': self.polls,
+                'average_matched': self.matched / self.lookups if self.lookups else 0.0,
+                'max_matched': self.max_matched, 'ambiguous': self.ambiguous,
+                'total_time': self.total_time, 'max_time': self.max_time,
+                'average_time': self.total_time / self.lookups if self.lookups else 0.0}
+
+
+class LocatorProfiler(object):
+
+    def __init__(self, pages=None):
+        """
+        Records every CustomElement and ElementsList lookup done through the wait engine:
+        locator, page-object attribute it comes from, time spent waiting, number of polls and number of nodes
+        the locator matches, counted with an additional find_elements call, so ambiguous locators show up.
+        :param pages: page object classes used to find owners of locators, all classes of the page registry by default
+        """
+        self.pages = pages
+        self._owners = None
+        self._statistics = {}
+
+    def install(self, engine=wait_engine):
+        engine.add_listener(self.on_wait)
+        return self
+
+    def uninstall(self, engine=wait_engine):
+        engine.remove_listener(self.on_wait)
+
+    def on_wait(self, driver, condition, wait_time, polls, value):
+        locator = getattr(condition, 'locator', None)
+        if not isinstance(locator, tuple):
+            return
+        locator_type, locator_value = locator
+        key = (locator_type, locator_value)
+        if key not in self._statistics:
+            self._statistics[key] = LocatorStatistics(self.owner_of(locator_value), locator_type, locator_value)
+        try:
+            matched = len(driver.find_elements(locator_type, locator_value))
+        except WebDriverException:
+            matched = 0
+        self._statistics[key].add(wait_time, polls, matched, timed_out=value is None,
+                                  single=getattr(condition, 'single', not isinstance(value, list)))
+
+    def owner_of(self, locator):
+        """
+        :return: "Page.attribute" which defines the locator, also when it was compiled to css
+        """
+        if self._owners is None:
+            self._owners = {}
+            pages = self.pages if self.pages is not None else page_registry.page_classes()
+            for page_class in pages:
+                for attribute, page_locator in page_locators(page_class).items():
+                    owner = f"{page_class.__name__}.{attribute}"
+                    self._owners.setdefault(page_locator, owner)
+                    self._owners.setdefault(compile_locator(page_locator)[1], owner)
+        return self._owners.get(locator, NOT_IN_PAGE_OBJECTS)
+
+    # -------------------------------------------------------------------------------------------------------
+    # report
+    def ranked(self):
+        """
+        :return: list of (page, total time, list of LocatorStatistics) with the slowest page and locator first
+        """
+        pages = {}
+        for statistics in self._statistics.values():
+            pages.setdefault(statistics.page, []).append(statistics)
+        ranked = [(page, sum(s.total_time for s in locators), sorted(locators, key=lambda s: -s.total_time))
+                  for page, locators in pages.items()]
+        return sorted(ranked, key=lambda item: -item[1])
+
+    def report(self, top=10):
+        """
+        :param top: how many locators of each page object should be listed
+        """
+        lines = ["Locator hot spots:"]
+        for page, total_time, locators in self.ranked():
+            lines.append(f"  {page}: {sum(s.lookups for s in locators)} lookups, total {total_time:.3f}s")
+            for statistics in locators[:top]:
+                lines.append(f"    {statistics.total_time:8.3f}s {statistics.lookups:5}x "
+                             f"max {statistics.max_time:.3f}s {statistics.polls} polls "
+                             f"{statistics.matched / statistics.lookups:.1f} matched "
+                             f"{statistics.timeouts} timeouts {statistics.ambiguous} ambiguous "
+                             f"{statistics.owner} {statistics.locator}")
+        return "\n".join(lines)
+
+    def save(self, path):
+        """
+        Writes statistics of all locators as JSON, slowest first.
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as profile_file:
+            json.dump([statistics.as_dict() for _, _, locators in self.ranked() for statistics in locators],
+                      profile_file, indent=2)
+        return path
@@ -0,0 +1,82 @@
+import re
+
+from utils.base_page import BasePage
+from utils.locator_compiler import PAGES_PACKAGE, discover_pages
+
+
+class PageMetadata(object):
+
+    def __init__(self, name, page_class):
+        """
+        Page object class found once per process and shared by all scenarios.
+        Compiled locators are shared too, utils.locator_compiler.compile_locator caches them for the whole process.
+        :param name: attribute of context.pages the page object is available under, i.e. "main_header"
+        """
+        self.name = name
+        self.page_class = page_class
+
+
+class PageRegistry(object):
+
+    def __init__(self, package=PAGES_PACKAGE):
+        """
+        Page object classes of the package, found on first use and then kept for the whole process.
+        Every class is available under the snake case of its name (MainHeader -> main_header),
+        a class can choose another one with a "context_name" attribute.
+        :param package: package searched for BasePage subclasses, BasePage itself is always registered
+        """
+        self.package = package
+        self._pages = None
+
+    @property
+    def pages(self):
+        """
+        :return: dict of PageMetadata by context attribute name
+        """
+        if self._pages is None:
+            pages = {}
+            for page_class in [BasePage, *discover_pages(self.package)]:
+                name = self.name_of(page_class)
+                if name in pages:
+                    raise Exception(f"{page_class.__name__} and {pages[name].page_class.__name__} "
+                                    f"are both registered as {name}")
+                pages[name] = PageMetadata(name, page_class)
+            self._pages = pages
+        return self._pages
+
+    def page_classes(self):
+        return [metadata.page_class for metadata in self.pages.values()]
+
+    def bind(self, driver):
+        """
+        :return: Pages which creates page objects of the driver on first access
+        """
+        return Pages(driver, self)
+
+    @staticmethod
+    def name_of(page_class):
+        # vars() and not getattr(), subclasses don't inherit the name of their parent
+        name = vars(page_class).get('context_name')
+        return name or re.sub(r'(?<!^)(?=[A-Z])', '_', page_class.__name__).lower()
+
+
+class Pages(object):
+
+    def __init__(self, driver, registry):
+        """
+        Page objects of one scenario, available as context.pages.<name>, i.e. context.pages.main_header.
+        A page object is created only when a step uses it and is kept until the end of the scenario.
+        """
+        self.driver = driver
+        self.registry = registry
+
+    def __getattr__(self, name):
+        # called only for attributes which are not set yet, so each page object is created once
+        if name.startswith('_') or name not in self.registry.pages:
+            raise AttributeError(f"No page object registered as {name}")
+        page = self.registry.pages[name].page_class(self.driver)
+        setattr(self, name, page)
+        return page
+
+
+page_registry = PageRegistry()
@@ -0,0 +1,116 @@
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+from behave.parser import parse_file
+
+from utils.caching_proxy import CachingProxy
+from utils.settings.settings import PATH_TO_PROJECT, USE_CACHING_PROXY
+
+DEFAULT_FEATURES = os.path.join(PATH_TO_PROJECT, 'scenarios', '*.feature')
+DEFAULT_OUTPUT_DIR = os.path.join(PATH_TO_PROJECT, 'parallel_output')
+
+
+def collect_scenarios(features_pattern=DEFAULT_FEATURES):
+    """
+    :param features_pattern: glob pattern of feature files
+    :return: list of scenario locations in behave format: "scenarios/open_main_page.feature:7"
+    """
+    locations = []
+    for feature_path in sorted(glob.glob(features_pattern)):
+        feature = parse_file(feature_path)
+        if not feature:
+            continue
+        for scenario in feature.scenarios:
+            locations.append(f"{os.path.relpath(feature_path, PATH_TO_PROJECT)}:{scenario.line}")
+    return locations
+
+
+def split_scenarios(locations, workers):
+    """
+    Spreads scenarios in round robin way, so scenarios of one feature end up on different workers.
+    :param locations: list of scenario locations
+    :param workers: number of worker processes
+    :return: list of lists of scenario locations, one list per worker
+    """
+    buckets = [[] for _ in range(workers)]
+    for index, location in enumerate(locations):
+        buckets[index % workers].append(location)
+    return [bucket for bucket in buckets if bucket]
+
+
+def start_worker(worker_id, locations, output_dir, behave_args):
+    """
+    Starts behave in a separate process with its own artifacts directory and json report.
+    :return: tuple of (Popen object, path to json report, opened log file)
+    """
+    worker_dir = os.path.join(output_dir, f"worker_{worker_id}")
+    os.makedirs(worker_dir, exist_ok=True)
+    report_path = os.path.join(worker_dir, 'report.json')
+    env = dict(os.environ)
+    env['ARTIFACTS_DIR'] = worker_dir
+    env.setdefault('USE_SESSION_POOL', 'true')
+    command = [sys.executable, '-m', 'behave', *locations, '-f', 'json', '-o', report_path,
+               '-f', 'plain', *behave_args]
+    log_file = open(os.path.join(worker_dir, 'behave.log'), 'w')
+    process = subprocess.Popen(command, cwd=PATH_TO_PROJECT, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+    return process, report_path, log_file
+
+
+def merge_reports(report_paths):
+    """
+    Merges json reports of workers into one behave json report.
+    Scenarios of the same feature run by different workers are put back together in file order.
+    :param report_paths: list of paths to json reports
+    :return: list of features in behave json format
+    """
+    features = {}
+    for report_path in report_paths:
+        if not os.path.exists(report_path):
+            continue
+        with open(report_path) as report_file:
+            for feature in json.load(report_file):
+                merged = features.setdefault(feature['location'], dict(feature, elements=[]))
+                merged['elements'].extend(feature.get('elements', []))
+                if feature.get('status') == 'failed':
+                    merged['status'] = 'failed'
+    for feature in features.values():
+        feature['elements'].sort(key=lambda element: int(element['location'].rsplit(':', 1)[1]))
+    return [features[location] for location in sorted(features)]
+
+
+def run(workers, features_pattern=DEFAULT_FEATURES, output_dir=DEFAULT_OUTPUT_DIR, behave_args=()):
+    """
+    Runs scenarios spread across worker processes and writes merged report to output_dir/report.json
+    :return: exit code, 0 when every worker passed
+    """
+    locations = collect_scenarios(features_pattern)
+    os.makedirs(output_dir, exist_ok=True)
+    # one proxy for all workers, their before_all finds its address in use and doesn't start another one
+    caching_proxy = CachingProxy.start_if_not_running() if USE_CACHING_PROXY else None
+    started = [start_worker(worker_id, bucket, output_dir, behave_args)
+               for worker_id, bucket in enumerate(split_scenarios(locations, workers))]
+    exit_code = 0
+    for process, _, log_file in started:
+        exit_code = process.wait() or exit_code
+        log_file.close()
+    if caching_proxy:
+        caching_proxy.stop()
+        print(caching_proxy.report())
+    merged_path = os.path.join(output_dir, 'report.json')
+    with open(merged_path, 'w') as merged_file:
+        json.dump(merge_reports([report_path for _, report_path, _ in started]), merged_file, indent=2)
+    print(f"{len(locations)} scenarios run by {len(started)} workers, report: {merged_path}")
+    return exit_code
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Runs behave scenarios in parallel worker processes.')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count())
+    parser.add_argument('-f', '--features', default=DEFAULT_FEATURES)
+    parser.add_argument('-o', '--output-dir', default=DEFAULT_OUTPUT_DIR)
+    arguments, extra_behave_args = parser.parse_known_args()
+    sys.exit(run(arguments.workers, arguments.features, arguments.output_dir, extra_behave_args))
@@ -0,0 +1,7 @@
+SELECTED_BROWSER = 'chrome'
+IMPLICITLY_WAIT = 5
+EXPLICITLY_WAIT = 2
+USER_PRODUCTION_URL = 'benchmarks/fixtures/main_page.html'
+USER_STAGING_URL = ''
+USER_DEV_URL = ''
+PREFERABLE_LOCATOR_SEARCHING_METHOD = 'xpath'
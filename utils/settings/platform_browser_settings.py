@@ -12,16 +12,19 @@ DRIVERS = {
         'chrome': 'chromedriver',
         'firefox': 'geckodriver',
         'edge': 'msedgedriver',
+        'lxml': 'lxml',
     },
     MACOS_PLATFORM: {
         'chrome': 'chromedriver',
         'firefox': 'geckodriver',
         'edge': 'msedgedriver',
+        'lxml': 'lxml',
     },
     WINDOWS_PLATFORM: {
         'chrome': 'chromedriver.exe',
         'firefox': 'geckodriver.exe',
         'edge': 'msedgedriver.exe',
+        'lxml': 'lxml',
     },
 }
 
@@ -42,7 +45,7 @@ def get_platform():
 def get_browser():
     if SELECTED_BROWSER == '':
         raise Exception('Browser not specified in platform_browser_settings.py')
-    if SELECTED_BROWSER == 'chrome' or SELECTED_BROWSER == 'edge' or SELECTED_BROWSER == 'firefox':
+    if SELECTED_BROWSER in ('chrome', 'edge', 'firefox', 'lxml'):
         pass
 
     else:
@@ -12,12 +12,58 @@ PRODUCTION_NETLOC = os.environ.get('PRODUCTION_NETLOC', '')
 STAGING_NETLOC = os.environ.get('STAGING_NETLOC', '')
 DEV_NETLOC = os.environ.get('DEV_NETLOC', '')
 TESTS_ENVIRONMENT = os.environ.get('TESTS_ENVIRONMENT', '')
-SYSTEM = os.environ.get('SYSTEM', get_platform())
-BROWSER = os.environ.get('BROWSER', get_browser())
-DRIVER = os.environ.get('DRIVER', get_driver_by_platform_name_and_browser(SYSTEM, BROWSER))
 IMPLICITLY_WAIT = IMPLICITLY_WAIT
 LOCATOR_SEARCHING_METHOD = get_preferable_locator_searching_method(PREFERABLE_LOCATOR_SEARCHING_METHOD)
 
+# optional
+BROWSER_PROFILE = os.environ.get('BROWSER_PROFILE', 'default')
+BLOCKED_RESOURCES = os.environ.get('BLOCKED_RESOURCES', '')
+USE_CACHING_PROXY = os.environ.get('USE_CACHING_PROXY', 'false').lower() == 'true'
+CACHING_PROXY_ADDRESS = os.environ.get('CACHING_PROXY_ADDRESS', '127.0.0.1:8899')
+CACHING_PROXY_DIR = os.environ.get('CACHING_PROXY_DIR', '')
+CACHING_PROXY_MAX_SIZE = float(os.environ.get('CACHING_PROXY_MAX_SIZE', 512))
+REUSE_DRIVER_SERVICE = os.environ.get('REUSE_DRIVER_SERVICE', 'true').lower() == 'true'
+USE_SESSION_POOL = os.environ.get('USE_SESSION_POOL', 'false').lower() == 'true'
+SESSION_POOL_MAX_USES = int(os.environ.get('SESSION_POOL_MAX_USES', 20))
+USE_ELEMENT_CACHE = os.environ.get('USE_ELEMENT_CACHE', 'false').lower() == 'true'
+COMPILE_LOCATORS = os.environ.get('COMPILE_LOCATORS', 'false').lower() == 'true'
+WAIT_INITIAL_POLL = float(os.environ.get('WAIT_INITIAL_POLL', 0.005))
+WAIT_MAX_POLL = float(os.environ.get('WAIT_MAX_POLL', 0.25))
+WAIT_BACKOFF_FACTOR = float(os.environ.get('WAIT_BACKOFF_FACTOR', 1.5))
+DOM_SETTLED_QUIET_PERIOD = float(os.environ.get('DOM_SETTLED_QUIET_PERIOD', 0.3))
+PRINT_WAIT_STATISTICS = os.environ.get('PRINT_WAIT_STATISTICS', 'false').lower() == 'true'
+TRACE_WEBDRIVER_COMMANDS = os.environ.get('TRACE_WEBDRIVER_COMMANDS', 'false').lower() == 'true'
+PROFILE_LOCATORS = os.environ.get('PROFILE_LOCATORS', 'false').lower() == 'true'
+PERSONS_SEED = os.environ.get('PERSONS_SEED', '')
+USE_PERSON_POOL = os.environ.get('USE_PERSON_POOL', 'false').lower() == 'true'
+PERSON_POOLS_DIR = os.environ.get('PERSON_POOLS_DIR', '')
+AVATAR_UPLOAD_SIZE = int(os.environ.get('AVATAR_UPLOAD_SIZE', 256))
+STATE_SNAPSHOTS_DIR = os.environ.get('STATE_SNAPSHOTS_DIR', '')
+STATE_SNAPSHOT_TTL = int(os.environ.get('STATE_SNAPSHOT_TTL', 1800))
+ARTIFACTS_DIR = os.environ.get('ARTIFACTS_DIR', '')
+SCREENSHOT_FORMAT = os.environ.get('SCREENSHOT_FORMAT', 'webp')
+SCREENSHOT_QUALITY = int(os.environ.get('SCREENSHOT_QUALITY', 80))
+
 # other const
 PATH_TO_PROJECT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+
+# resolved on first use, so imports (i.e. behave --dry-run) don't depend on the selected browser and driver
+def _driver():
+    system, browser = __getattr__('SYSTEM'), __getattr__('BROWSER')
+    return os.environ.get('DRIVER') or get_driver_by_platform_name_and_browser(system, browser)
+
+
+LAZY_SETTINGS = {
+    'SYSTEM': lambda: os.environ.get('SYSTEM') or get_platform(),
+    'BROWSER': lambda: os.environ.get('BROWSER') or get_browser(),
+    'DRIVER': _driver,
+}
+
+
+def __getattr__(name):
+    if name not in LAZY_SETTINGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name not in globals():
+        globals()[name] = LAZY_SETTINGS[name]()
+    return globals()[name]
@@ -0,0 +1,79 @@
+import json
+import os
+import re
+import time
+
+from utils.settings.settings import PATH_TO_PROJECT, STATE_SNAPSHOTS_DIR, STATE_SNAPSHOT_TTL
+
+ROLE_TAG_PREFIX = 'role_'
+COOKIE_KEYS = ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry')
+
+login_flows = {}
+
+
+def login_flow(role):
+    """
+    Registers function(context) which signs in as the role, i.e. in steps module:
+
+        @login_flow('client')
+        def sign_in_client(context):
+            ...
+
+    It is run before scenarios tagged @role_client when there is no valid snapshot of the role,
+    then state of the browser is captured, so next scenarios start already signed in.
+    """
+    def register(function):
+        login_flows[role] = function
+        return function
+    return register
+
+
+def roles_of(tags):
+    """
+    :return: list of roles from @role_<name> tags
+    """
+    return [tag[len(ROLE_TAG_PREFIX):] for tag in tags if tag.startswith(ROLE_TAG_PREFIX)]
+
+
+class SnapshotStore(object):
+
+    def __init__(self, directory=STATE_SNAPSHOTS_DIR, ttl=STATE_SNAPSHOT_TTL):
+        """
+        Snapshots of signed in browser state (cookies, local and session storage) kept on disk per role.
+        Files hold session cookies, so they are readable only by the owner.
+        :param directory: directory of <role>.json files, .state_snapshots in the project by default
+        :param ttl: how many seconds a snapshot is valid, sessions of the site expire after some time
+        """
+        self.directory = directory or os.path.join(PATH_TO_PROJECT, '.state_snapshots')
+        self.ttl = ttl
+
+    def path_of(self, role):
+        return os.path.join(self.directory, re.sub(r'\W+', '_', role) + '.json')
+
+    def save(self, role, snapshot):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_of(role)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as snapshot_file:
+            json.dump(dict(snapshot, created_at=time.time()), snapshot_file)
+        os.replace(temporary_path, path)
+
+    def load(self, role):
+        """
+        :return: snapshot dict or None when there is no snapshot of the role or it expired
+        """
+        try:
+            with open(self.path_of(role)) as snapshot_file:
+                snapshot = json.load(snapshot_file)
+        except (OSError, ValueError):
+            return None
+        if time.time() - snapshot.get('created_at', 0) > self.ttl:
+            return None
+        return snapshot
+
+    def delete(self, role):
+        if os.path.exists(self.path_of(role)):
+            os.remove(self.path_of(role))
+
+
+snapshot_store = SnapshotStore()
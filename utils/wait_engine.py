@@ -0,0 +1,150 @@
+import time
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from utils.settings.local_settings import EXPLICITLY_WAIT
+from utils.settings.settings import WAIT_INITIAL_POLL, WAIT_MAX_POLL, WAIT_BACKOFF_FACTOR
+
+
+class WaitStatistics(object):
+
+    def __init__(self):
+        self.count = 0
+        self.timeouts = 0
+        self.polls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def add(self, wait_time, polls, timed_out):
+        self.count += 1
+        self.polls += polls
+        self.total_time += wait_time
+        self.max_time = max(self.max_time, wait_time)
+        if timed_out:
+            self.timeouts += 1
+
+    def as_dict(self):
+        return {'count': self.count, 'timeouts': self.timeouts, 'polls': self.polls,
+                'total_time': self.total_time, 'max_time': self.max_time,
+                'average_time': self.total_time / self.count if self.count else 0.0}
+
+
+class LocatorCondition(object):
+
+    def __init__(self, locator, check, single=True):
+        """
+        Condition built from a function, which like selenium expected conditions exposes the locator it waits for,
+        so listeners (i.e. locator profiler) see lookups which are not done with expected conditions.
+        :param locator: tuple of (locator type, locator)
+        :param check: function called with the driver (or element) passed to until()
+        :param single: the lookup is of one element, False when many elements are expected to match
+        """
+        self.locator = locator
+        self.check = check
+        self.single = single
+
+    def __call__(self, driver):
+        return self.check(driver)
+
+
+class WaitEngine(object):
+
+    def __init__(self, initial_poll=WAIT_INITIAL_POLL, max_poll=WAIT_MAX_POLL, backoff_factor=WAIT_BACKOFF_FACTOR):
+        """
+        Replacement of WebDriverWait used by BasePage, CustomElement and ElementsList.
+        It starts polling every few milliseconds and backs off up to max_poll, so short waits return quickly
+        and long waits don't flood the driver with requests.
+        Browsers are started without implicit wait, so explicit waits never stack with implicit ones.
+        :param initial_poll: first interval between checks in seconds
+        :param max_poll: longest interval between checks in seconds
+        :param backoff_factor: how many times the interval grows after each unsuccessful check
+        """
+        self.initial_poll = initial_poll
+        self.max_poll = max_poll
+        self.backoff_factor = backoff_factor
+        self._statistics = {}
+        self._listeners = []
+
+    def until(self, driver, condition, wait=EXPLICITLY_WAIT, name=None, ignored_exceptions=(NoSuchElementException,)):
+        """
+        Calls condition with driver until it returns something truthy.
+        :param driver: driver (or element) passed to the condition
+        :param condition: expected condition, i.e. ec.visibility_of_element_located((By.XPATH, "//div"))
+        :param wait: how many seconds at most to wait
+        :param name: name under which statistics are recorded, by default name of the condition
+        :param ignored_exceptions: exceptions treated as unsuccessful check
+        :return: value returned by the condition
+        """
+        name = name or self._condition_name(condition)
+        start = time.perf_counter()
+        end = start + wait
+        poll = self.initial_poll
+        polls = 0
+        while True:
+            polls += 1
+            try:
+                value = condition(driver)
+                if value:
+                    self.record(name, time.perf_counter() - start, polls, timed_out=False)
+                    self._notify(driver, condition, time.perf_counter() - start, polls, value)
+                    return value
+            except ignored_exceptions:
+                pass
+            now = time.perf_counter()
+            if now >= end:
+                self.record(name, now - start, polls, timed_out=True)
+                self._notify(driver, condition, now - start, polls, None)
+                raise TimeoutException(f"Condition {name} was not met within {wait} seconds")
+            time.sleep(min(poll, end - now))
+            poll = min(poll * self.backoff_factor, self.max_poll)
+
+    # -------------------------------------------------------------------------------------------------------
+    # statistics
+    def statistics(self):
+        """
+        :return: dict of condition name to dict with count, timeouts, polls, total, max and average wait time
+        """
+        return {name: statistics.as_dict() for name, statistics in self._statistics.items()}
+
+    def report(self):
+        """
+        :return: a string with wait statistics, longest total wait time first
+        """
+        lines = ["Wait statistics:"]
+        for name, statistics in sorted(self._statistics.items(), key=lambda item: -item[1].total_time):
+            lines.append(f"  {name}: {statistics.count} waits, {statistics.timeouts} timeouts, "
+                         f"{statistics.polls} polls, total {statistics.total_time:.3f}s, "
+                         f"max {statistics.max_time:.3f}s")
+        return "\n".join(lines)
+
+    def reset_statistics(self):
+        self._statistics = {}
+
+    def record(self, name, wait_time, polls, timed_out):
+        """
+        Adds a wait which was done outside of until(), i.e. inside the browser, to statistics.
+        """
+        self._statistics.setdefault(name, WaitStatistics()).add(wait_time, polls, timed_out)
+
+    # -------------------------------------------------------------------------------------------------------
+    # listeners
+    def add_listener(self, listener):
+        """
+        :param listener: function(driver, condition, wait_time, polls, value) called after every until(),
+                         value is None when the wait timed out
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    def _notify(self, driver, condition, wait_time, polls, value):
+        for listener in self._listeners:
+            listener(driver, condition, wait_time, polls, value)
+
+    @staticmethod
+    def _condition_name(condition):
+        return getattr(condition, '__name__', type(condition).__name__)
+
+
+wait_engine = WaitEngine()